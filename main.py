@@ -4,35 +4,69 @@ Mengekspos multi-agent system sebagai API yang production-ready
 """
 from fastapi import FastAPI, HTTPException, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
+from contextlib import asynccontextmanager
 from typing import Optional, Dict, Any, List
+import asyncio
+import logging
+import random
+import time
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
+from cachetools import TTLCache
+import orjson
 
 from src.orchestrator.orchestrator import OrchestratorAgent
+from src.orchestrator.fast_path import try_fast_path
+from src.agents.upstream_agent import UpstreamAgent
+from src.agents.logistics_agent import LogisticsAgent
+from src.agents.finance_agent import FinanceAgent
 from src.utils.config import settings
+from src.utils.cache import response_cache_key
 from src.utils.logger import setup_logging, get_logger
-from src.utils.state import AgentState
-from langchain_core.messages import HumanMessage
+from src.utils.llm import aclose_shared_clients, prewarm_shared_clients
 
 # Setup logging
 setup_logging()
 logger = get_logger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan - prewarm shared LLM connection pools dan model semantic cache,
+    release pools on shutdown
+    """
+    errors = await prewarm_shared_clients()
+    if errors:
+        logger.warning("LLM connection prewarm failed", error=str(errors[0]))
+    
+    # Semantic cache hanya optimasi: jika model tidak bisa di-load, matikan alih-alih gagal per request
+    if orchestrator.semantic_cache is not None:
+        try:
+            await asyncio.to_thread(orchestrator.semantic_cache.load)
+        except Exception as e:
+            logger.warning("Semantic cache disabled, model failed to load", error=str(e))
+            orchestrator.semantic_cache = None
+    yield
+    await aclose_shared_clients()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="XYZ AI Nexus",
     description="Multi-Agent AI System for XYZ Operations",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.allowed_origins_list,
+    allow_origins=settings.allowed_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -41,6 +75,13 @@ app.add_middleware(
 # Initialize orchestrator (singleton)
 orchestrator = OrchestratorAgent()
 
+# Exact-match response cache, keyed on normalized (user_role, query).
+# Hanya diakses dari event loop, jadi tidak perlu lock.
+_response_cache: TTLCache = TTLCache(
+    maxsize=settings.response_cache_maxsize,
+    ttl=settings.response_cache_ttl
+)
+
 # Request/Response models
 class QueryRequest(BaseModel):
     """Request model for agent query"""
@@ -68,7 +109,7 @@ class AgentResponse(BaseModel):
     response: str
     agents_involved: List[str]
     execution_time_ms: float
-    timestamp: str
+    timestamp: datetime
     metadata: Dict[str, Any]
 
 
@@ -77,28 +118,107 @@ class HealthResponse(BaseModel):
     status: str
     version: str
     agents_available: List[str]
-    timestamp: str
+    timestamp: datetime
+
+
+# Static payloads - dibangun sekali saat startup, hanya field dinamis yang di-update per request.
+# AGENTS_PAYLOAD membaca metadata di level class agar tidak memicu pembuatan agent (lazy).
+_AGENTS_AVAILABLE = ("upstream", "logistics", "finance")
+
+HEALTH_RESPONSE_TEMPLATE = HealthResponse(
+    status="healthy",
+    version="1.0.0",
+    agents_available=list(_AGENTS_AVAILABLE),
+    timestamp=datetime.min
+)
+
+CLARIFY_RESPONSE_TEMPLATE = AgentResponse(
+    session_id="",
+    query="",
+    routing_decision="CLARIFY",
+    response="I need more information to help you. Could you please clarify your question? Are you asking about production data, shipping logistics, or financial analysis?",
+    agents_involved=[],
+    execution_time_ms=0,
+    timestamp=datetime.min,
+    metadata={"status": "clarification_needed"}
+)
+
+AGENTS_PAYLOAD: Dict[str, Any] = {
+    "agents": [
+        {
+            "name": "Upstream Agent",
+            "description": UpstreamAgent.description,
+            "capabilities": [
+                "Production data retrieval",
+                "Lifting schedule queries",
+                "Well status monitoring"
+            ],
+            "tools": UpstreamAgent.tools_list
+        },
+        {
+            "name": "Logistics Agent",
+            "description": LogisticsAgent.description,
+            "capabilities": [
+                "Vessel tracking",
+                "Weather forecasting",
+                "Delivery status tracking"
+            ],
+            "tools": LogisticsAgent.tools_list
+        },
+        {
+            "name": "Finance Agent",
+            "description": FinanceAgent.description,
+            "capabilities": [
+                "Revenue calculation",
+                "Cost analysis",
+                "Profitability assessment"
+            ],
+            "tools": FinanceAgent.tools_list
+        }
+    ],
+    "routing_patterns": {
+        "single_agent": ["UPSTREAM", "LOGISTICS", "FINANCE"],
+        "multi_agent": ["UPSTREAM_LOGISTICS", "UPSTREAM_FINANCE", "LOGISTICS_FINANCE", "ALL_AGENTS"]
+    }
+}
+
+
+# Request logging: /query selalu dicatat, /health (liveness probe) dilewati,
+# path lain di-sample kecuali jika response error
+_ALWAYS_LOG_PATHS = {"/query", "/query/stream"}
+_SKIP_LOG_PATHS = {"/health"}
 
 
 # Middleware for request logging
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    """Log all incoming requests"""
-    request_id = str(uuid.uuid4())
-    logger.info(
-        "Request received",
-        request_id=request_id,
-        method=request.method,
-        path=request.url.path
+    """Log incoming requests (sampled for non-query endpoints)"""
+    path = request.url.path
+    if path in _SKIP_LOG_PATHS:
+        return await call_next(request)
+    
+    # Level check dulu: di bawah INFO tidak perlu sampling, uuid, maupun payload log
+    need_log = logger.is_enabled_for(logging.INFO) and (
+        path in _ALWAYS_LOG_PATHS or random.random() < settings.request_log_sample_rate
     )
+    request_id = str(uuid.uuid4()) if need_log else None
+    if need_log:
+        logger.info(
+            "Request received",
+            request_id=request_id,
+            method=request.method,
+            path=path
+        )
     
     response = await call_next(request)
     
-    logger.info(
-        "Request completed",
-        request_id=request_id,
-        status_code=response.status_code
-    )
+    if need_log or response.status_code >= 500:
+        logger.info(
+            "Request completed",
+            request_id=request_id,
+            path=path,
+            status_code=response.status_code
+        )
     
     return response
 
@@ -114,22 +234,34 @@ async def root():
     }
 
 
+# Timestamp response di-cache per bucket 50ms: request yang datang hampir bersamaan
+# berbagi satu objek datetime (tetap akurat untuk timestamp yang dibaca manusia)
+_TIMESTAMP_BUCKET_SECONDS = 0.05
+_timestamp_cache = {"ts": 0.0, "value": datetime.min}
+
+
+def _utcnow_cached() -> datetime:
+    """UTC now, di-refresh paling sering sekali per 50ms"""
+    now = time.time()
+    if now - _timestamp_cache["ts"] > _TIMESTAMP_BUCKET_SECONDS:
+        _timestamp_cache["ts"] = now
+        # Naive UTC seperti sebelumnya, tanpa utcfromtimestamp (deprecated sejak Python 3.12)
+        _timestamp_cache["value"] = datetime.fromtimestamp(now, timezone.utc).replace(tzinfo=None)
+    return _timestamp_cache["value"]
+
+
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """
     Health check endpoint.
     Returns status of the API and available agents.
     """
-    return HealthResponse(
-        status="healthy",
-        version="1.0.0",
-        agents_available=[
-            "upstream",
-            "logistics", 
-            "finance"
-        ],
-        timestamp=datetime.utcnow().isoformat()
-    )
+    return HEALTH_RESPONSE_TEMPLATE.model_copy(update={"timestamp": _utcnow_cached()})
+
+
+def _elapsed_ms(t0: int) -> float:
+    """Milliseconds elapsed since a time.perf_counter_ns() reading"""
+    return (time.perf_counter_ns() - t0) / 1e6
 
 
 @app.post("/query", response_model=AgentResponse)
@@ -148,7 +280,7 @@ async def process_query(
     
     Security: Optional API key authentication via X-API-Key header
     """
-    start_time = datetime.utcnow()
+    t0 = time.perf_counter_ns()  # monotonic, tidak terpengaruh perubahan jam sistem
     
     # Generate session ID if not provided
     session_id = request.session_id or str(uuid.uuid4())
@@ -161,6 +293,19 @@ async def process_query(
         query=request.query[:100]
     )
     
+    # Step 0: Serve identical (query, role) pairs from cache, skipping routing and execution
+    cache_key = response_cache_key(request.query, request.user_role)
+    cached_response = _response_cache.get(cache_key)
+    if cached_response is not None:
+        logger.info("Response cache hit", session_id=session_id)
+        return cached_response.model_copy(update={
+            "session_id": session_id,
+            "query": request.query,
+            "execution_time_ms": round(_elapsed_ms(t0), 2),
+            "timestamp": _utcnow_cached(),
+            "metadata": {**cached_response.metadata, "user_id": user_id, "cache": "hit"}
+        })
+    
     try:
         # Step 1: Classify intent and determine routing
         routing_decision = orchestrator.classify_intent(request.query)
@@ -171,51 +316,40 @@ async def process_query(
             session_id=session_id
         )
         
-        # Step 2: Initialize state
-        initial_state: AgentState = {
-            "messages": [HumanMessage(content=request.query)],
-            "user_id": user_id,
-            "session_id": session_id,
-            "user_role": request.user_role,
-            "next_agent": None,
-            "current_agent": None,
-            "intent_classification": routing_decision,
-            "task_completed": False,
-            "iterations": 0,
-            "max_iterations": settings.max_iterations,
-            "intermediate_data": request.context,
-            "final_response": None,
-            "response_metadata": {}
-        }
-        
-        # Step 3: Determine entry point based on routing
-        agents_to_invoke = []
-        
-        if "UPSTREAM" in routing_decision:
-            agents_to_invoke.append("upstream")
-        if "LOGISTICS" in routing_decision:
-            agents_to_invoke.append("logistics")
-        if "FINANCE" in routing_decision:
-            agents_to_invoke.append("finance")
-        
-        # Handle clarification needed
+        # Step 2: Handle clarification needed
         if routing_decision == "CLARIFY":
+            return CLARIFY_RESPONSE_TEMPLATE.model_copy(update={
+                "session_id": session_id,
+                "query": request.query,
+                "timestamp": _utcnow_cached()
+            })
+        
+        # Step 2b: Simple single-tool queries bypass LangGraph entirely.
+        # Tidak di-cache: tool dipanggil langsung jadi data selalu terbaru dan tetap murah
+        fast_response = await try_fast_path(routing_decision, request.query)
+        if fast_response is not None:
             return AgentResponse(
                 session_id=session_id,
                 query=request.query,
                 routing_decision=routing_decision,
-                response="I need more information to help you. Could you please clarify your question? Are you asking about production data, shipping logistics, or financial analysis?",
-                agents_involved=[],
-                execution_time_ms=0,
-                timestamp=datetime.utcnow().isoformat(),
-                metadata={"status": "clarification_needed"}
+                response=fast_response,
+                agents_involved=[routing_decision.lower()],
+                execution_time_ms=round(_elapsed_ms(t0), 2),
+                timestamp=_utcnow_cached(),
+                metadata={
+                    "user_id": user_id,
+                    "user_role": request.user_role,
+                    "status": "completed",
+                    "engine": "fast_path"
+                }
             )
         
-        # Step 4: Execute agent(s) using LangGraph
+        # Step 3: Execute agent(s) using LangGraph (paraphrases served from the orchestrator's semantic cache)
         result = await orchestrator.run(
             query=request.query,
             user_id=user_id,
-            user_role=request.user_role
+            user_role=request.user_role,
+            routing_decision=routing_decision
         )
         
         final_response = result["response"]
@@ -223,7 +357,7 @@ async def process_query(
         routing_decision = result["routing_decision"]
         
         # Calculate execution time
-        execution_time = (datetime.utcnow() - start_time).total_seconds() * 1000
+        execution_time = _elapsed_ms(t0)
         
         logger.info(
             "Query processed successfully via LangGraph",
@@ -232,21 +366,28 @@ async def process_query(
             agents_involved=agents_to_invoke
         )
         
-        return AgentResponse(
+        metadata = {
+            "user_id": user_id,
+            "user_role": request.user_role,
+            "status": "completed",
+            "engine": "langgraph"
+        }
+        if result.get("cache"):
+            metadata["cache"] = result["cache"]
+        
+        response = AgentResponse(
             session_id=session_id,
             query=request.query,
             routing_decision=routing_decision,
             response=final_response,
             agents_involved=agents_to_invoke,
             execution_time_ms=round(execution_time, 2),
-            timestamp=datetime.utcnow().isoformat(),
-            metadata={
-                "user_id": user_id,
-                "user_role": request.user_role,
-                "status": "completed",
-                "engine": "langgraph"
-            }
+            timestamp=_utcnow_cached(),
+            metadata=metadata
         )
+        _response_cache[cache_key] = response
+        
+        return response
         
     except Exception as e:
         logger.error(
@@ -261,50 +402,100 @@ async def process_query(
         )
 
 
+def _sse(event: str, data: Any) -> str:
+    """Format one Server-Sent Event frame"""
+    payload = data if isinstance(data, str) else orjson.dumps(data).decode()
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+@app.post("/query/stream")
+async def process_query_stream(
+    request: QueryRequest,
+    x_api_key: Optional[str] = Header(None)
+):
+    """
+    Streaming variant of /query using Server-Sent Events.
+    
+    Events:
+    - routing: routing decision, sent before any agent runs
+    - agent: a specialist agent started working
+    - token: LLM token chunk as it is generated
+    - final: full AgentResponse payload
+    - error: processing failed
+    """
+    t0 = time.perf_counter_ns()
+    session_id = request.session_id or str(uuid.uuid4())
+    user_id = request.user_id or "anonymous"
+    
+    logger.info(
+        "Processing streaming query",
+        session_id=session_id,
+        user_id=user_id,
+        query=request.query[:100]
+    )
+    
+    async def event_stream():
+        try:
+            routing_decision = orchestrator.classify_intent(request.query)
+            yield _sse("routing", {"routing": routing_decision})
+            
+            if routing_decision == "CLARIFY":
+                clarify = CLARIFY_RESPONSE_TEMPLATE.model_copy(update={
+                    "session_id": session_id,
+                    "query": request.query,
+                    "timestamp": _utcnow_cached()
+                })
+                yield _sse("final", clarify.model_dump_json())
+                return
+            
+            async for event in orchestrator.run_stream(
+                query=request.query,
+                user_id=user_id,
+                user_role=request.user_role,
+                routing_decision=routing_decision
+            ):
+                if event["type"] != "final":
+                    yield _sse(event["type"], event)
+                    continue
+                
+                execution_time = _elapsed_ms(t0)
+                response = AgentResponse(
+                    session_id=session_id,
+                    query=request.query,
+                    routing_decision=event["routing_decision"],
+                    response=event["response"],
+                    agents_involved=event["agents_involved"],
+                    execution_time_ms=round(execution_time, 2),
+                    timestamp=_utcnow_cached(),
+                    metadata={
+                        "user_id": user_id,
+                        "user_role": request.user_role,
+                        "status": "completed",
+                        "engine": "langgraph",
+                        "streaming": True
+                    }
+                )
+                yield _sse("final", response.model_dump_json())
+        
+        except Exception as e:
+            logger.error(
+                "Streaming query failed",
+                session_id=session_id,
+                error=str(e),
+                exc_info=True
+            )
+            yield _sse("error", {"message": f"Failed to process query: {str(e)}"})
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @app.get("/agents", response_model=Dict[str, Any])
 async def list_agents():
     """
     List all available agents and their capabilities.
     Useful for documentation and discovery.
     """
-    return {
-        "agents": [
-            {
-                "name": "Upstream Agent",
-                "description": orchestrator.upstream_agent.description,
-                "capabilities": [
-                    "Production data retrieval",
-                    "Lifting schedule queries",
-                    "Well status monitoring"
-                ],
-                "tools": orchestrator.upstream_agent.tools_list
-            },
-            {
-                "name": "Logistics Agent",
-                "description": orchestrator.logistics_agent.description,
-                "capabilities": [
-                    "Vessel tracking",
-                    "Weather forecasting",
-                    "Delivery status tracking"
-                ],
-                "tools": orchestrator.logistics_agent.tools_list
-            },
-            {
-                "name": "Finance Agent",
-                "description": orchestrator.finance_agent.description,
-                "capabilities": [
-                    "Revenue calculation",
-                    "Cost analysis",
-                    "Profitability assessment"
-                ],
-                "tools": orchestrator.finance_agent.tools_list
-            }
-        ],
-        "routing_patterns": {
-            "single_agent": ["UPSTREAM", "LOGISTICS", "FINANCE"],
-            "multi_agent": ["UPSTREAM_LOGISTICS", "UPSTREAM_FINANCE", "LOGISTICS_FINANCE", "ALL_AGENTS"]
-        }
-    }
+    return AGENTS_PAYLOAD
 
 
 @app.exception_handler(Exception)
@@ -317,19 +508,23 @@ async def global_exception_handler(request: Request, exc: Exception):
         exc_info=True
     )
     
-    return JSONResponse(
+    return Response(
         status_code=500,
-        content={
+        content=orjson.dumps({
             "error": "Internal server error",
             "message": str(exc),
             "path": request.url.path
-        }
+        }),
+        media_type="application/json"
     )
 
 
 if __name__ == "__main__":
+    import os
     import uvicorn
     
+    is_development = settings.app_env == "development"
+    
     logger.info(
         "Starting XYZ AI Nexus",
         host=settings.api_host,
@@ -337,9 +532,18 @@ if __name__ == "__main__":
         env=settings.app_env
     )
     
+    # uvloop + httptools (bagian dari uvicorn[standard]) untuk throughput I/O-bound,
+    # keep-alive panjang agar client reuse koneksi TCP/TLS antar query.
+    # loop="auto" memilih uvloop jika ter-install, fallback ke asyncio (misal di Windows,
+    # di mana uvloop tidak tersedia) alih-alih gagal start.
+    # reload dan multi-worker tidak bisa dipakai bersamaan, jadi development tetap 1 worker.
     uvicorn.run(
         "main:app",
         host=settings.api_host,
         port=settings.api_port,
-        reload=settings.app_env == "development"
+        reload=is_development,
+        loop="auto",
+        http="httptools",
+        timeout_keep_alive=75,
+        workers=1 if is_development else (os.cpu_count() or 2)
     )
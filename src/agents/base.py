@@ -0,0 +1,40 @@
+"""
+Base Specialist Agent - Satu class generik untuk semua specialist
+Setiap agent hanya berbeda di data (nama, tools, prompt, deskripsi), jadi perilakunya
+didefinisikan sekali di sini dan dikonfigurasi lewat AgentSpec
+"""
+from typing import NamedTuple
+from langchain_core.messages import SystemMessage
+from src.utils.config import get_settings
+from src.utils.logger import get_logger
+from src.utils.llm import make_llm
+
+logger = get_logger(__name__)
+
+
+class AgentSpec(NamedTuple):
+    """Konfigurasi statis satu specialist agent"""
+    name: str
+    tools: list
+    system_prompt: SystemMessage
+    description: str
+
+
+class Agent:
+    """
+    Specialist agent generik: LLM dengan tools ter-bind plus system prompt.
+    Dibuat dari AgentSpec, misal Agent(*UPSTREAM_SPEC). SystemMessage di spec
+    dialokasikan sekali saat import dan dipakai bersama oleh semua instance.
+    """
+    
+    def __init__(self, name: str, tools: list, system_prompt: SystemMessage, description: str):
+        self.name = name
+        self.tools = tools
+        self.tools_list = tuple(tool.name for tool in tools)
+        self.description = description
+        
+        # Initialize LLM dengan tools
+        self.llm = make_llm(tools)
+        self.system_prompt = system_prompt
+        
+        logger.info("Agent initialized", agent=name, model=get_settings().default_llm_model)
@@ -1,39 +1,18 @@
 """
 Finance Agent - Specialist untuk analisis keuangan dan profitabilitas
 """
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage
+from src.agents.base import Agent, AgentSpec
 from src.tools.finance_tools import finance_tools
-from src.utils.config import settings
-from src.utils.logger import get_logger
 
-logger = get_logger(__name__)
 
+FINANCE_DESCRIPTION = (
+    "Specialist in financial analysis and profitability. "
+    "Handles queries about revenue impact, operating costs, "
+    "profit margins, and market price trends."
+)
 
-class FinanceAgent:
-    """
-    Agen khusus untuk analisis keuangan, revenue impact, dan profitabilitas.
-    Memiliki akses ke kalkulasi revenue, operating cost, dan market trends.
-    """
-    
-    def __init__(self):
-        self.name = "Finance Agent"
-        self.tools = finance_tools
-        self.tools_list = [tool.name for tool in finance_tools]
-        self.description = (
-            "Specialist in financial analysis and profitability. "
-            "Handles queries about revenue impact, operating costs, "
-            "profit margins, and market price trends."
-        )
-        
-        self.llm = ChatOpenAI(
-            model=settings.default_llm_model,
-            temperature=0.1,
-            api_key=settings.deepseek_api_key,
-            base_url=settings.deepseek_base_url
-        ).bind_tools(finance_tools)
-        
-        self.system_prompt = SystemMessage(content="""
+FINANCE_SYSTEM_PROMPT = SystemMessage(content="""
 You are the Financial Analysis Specialist for XYZ.
 
 Your expertise:
@@ -71,11 +50,20 @@ Response format:
 Financial note: All calculations use current market prices unless specified otherwise.
 Assume Indonesian Crude Price (ICP) benchmark at ~$85/barrel for oil.
 """)
-        
-        logger.info("Finance Agent initialized", model=settings.default_llm_model)
+
+FINANCE_TOOL_NAMES = tuple(tool.name for tool in finance_tools)
+
+FINANCE_SPEC = AgentSpec("Finance Agent", finance_tools, FINANCE_SYSTEM_PROMPT, FINANCE_DESCRIPTION)
+
+
+class FinanceAgent(Agent):
+    """
+    Agen khusus untuk analisis keuangan, revenue impact, dan profitabilitas.
+    Memiliki akses ke kalkulasi revenue, operating cost, dan market trends.
+    """
     
-    def get_prompt(self) -> SystemMessage:
-        return self.system_prompt
+    name, tools, system_prompt, description = FINANCE_SPEC
+    tools_list = FINANCE_TOOL_NAMES
     
-    def get_llm(self):
-        return self.llm
+    def __init__(self):
+        super().__init__(*FINANCE_SPEC)
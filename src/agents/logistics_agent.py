@@ -1,39 +1,18 @@
 """
 Logistics Agent - Specialist untuk tracking pengiriman dan kapal
 """
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage
+from src.agents.base import Agent, AgentSpec
 from src.tools.logistics_tools import logistics_tools
-from src.utils.config import settings
-from src.utils.logger import get_logger
 
-logger = get_logger(__name__)
 
+LOGISTICS_DESCRIPTION = (
+    "Specialist in maritime logistics and vessel tracking. "
+    "Handles queries about tanker positions, weather conditions, "
+    "delivery schedules, and shipping delays."
+)
 
-class LogisticsAgent:
-    """
-    Agen khusus untuk menangani tracking kapal tanker dan logistik pengiriman.
-    Memiliki akses ke vessel tracking, weather data, dan delivery status.
-    """
-    
-    def __init__(self):
-        self.name = "Logistics Agent"
-        self.tools = logistics_tools
-        self.tools_list = [tool.name for tool in logistics_tools]
-        self.description = (
-            "Specialist in maritime logistics and vessel tracking. "
-            "Handles queries about tanker positions, weather conditions, "
-            "delivery schedules, and shipping delays."
-        )
-        
-        self.llm = ChatOpenAI(
-            model=settings.default_llm_model,
-            temperature=0.1,
-            api_key=settings.deepseek_api_key,
-            base_url=settings.deepseek_base_url
-        ).bind_tools(logistics_tools)
-        
-        self.system_prompt = SystemMessage(content="""
+LOGISTICS_SYSTEM_PROMPT = SystemMessage(content="""
 You are the Maritime Logistics Specialist for XYZ.
 
 Your expertise:
@@ -69,11 +48,20 @@ Response format:
 
 Safety note: Always prioritize crew and cargo safety over schedule.
 """)
-        
-        logger.info("Logistics Agent initialized", model=settings.default_llm_model)
+
+LOGISTICS_TOOL_NAMES = tuple(tool.name for tool in logistics_tools)
+
+LOGISTICS_SPEC = AgentSpec("Logistics Agent", logistics_tools, LOGISTICS_SYSTEM_PROMPT, LOGISTICS_DESCRIPTION)
+
+
+class LogisticsAgent(Agent):
+    """
+    Agen khusus untuk menangani tracking kapal tanker dan logistik pengiriman.
+    Memiliki akses ke vessel tracking, weather data, dan delivery status.
+    """
     
-    def get_prompt(self) -> SystemMessage:
-        return self.system_prompt
+    name, tools, system_prompt, description = LOGISTICS_SPEC
+    tools_list = LOGISTICS_TOOL_NAMES
     
-    def get_llm(self):
-        return self.llm
+    def __init__(self):
+        super().__init__(*LOGISTICS_SPEC)
@@ -0,0 +1,13 @@
+"""
+Agent Registry - Tabel konfigurasi semua specialist agent
+Key adalah nama graph node di orchestrator
+"""
+from src.agents.upstream_agent import UPSTREAM_SPEC
+from src.agents.logistics_agent import LOGISTICS_SPEC
+from src.agents.finance_agent import FINANCE_SPEC
+
+AGENT_SPECS = {
+    "upstream": UPSTREAM_SPEC,
+    "logistics": LOGISTICS_SPEC,
+    "finance": FINANCE_SPEC
+}
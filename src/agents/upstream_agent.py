@@ -2,41 +2,18 @@
 Upstream Agent - Specialist untuk data produksi migas
 Mengikuti prinsip spesialisasi dari penelitian: agen dengan peran, alat, dan memori yang spesifik
 """
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage
+from src.agents.base import Agent, AgentSpec
 from src.tools.upstream_tools import upstream_tools
-from src.utils.config import settings
-from src.utils.logger import get_logger
 
-logger = get_logger(__name__)
 
+UPSTREAM_DESCRIPTION = (
+    "Specialist in oil & gas upstream production data. "
+    "Handles queries about production volumes, lifting schedules, "
+    "well status, and field operations."
+)
 
-class UpstreamAgent:
-    """
-    Agen khusus untuk menangani pertanyaan terkait produksi upstream XYZ.
-    Memiliki akses ke data produksi, lifting schedule, dan status sumur.
-    """
-    
-    def __init__(self):
-        self.name = "Upstream Agent"
-        self.tools = upstream_tools
-        self.tools_list = [tool.name for tool in upstream_tools]
-        self.description = (
-            "Specialist in oil & gas upstream production data. "
-            "Handles queries about production volumes, lifting schedules, "
-            "well status, and field operations."
-        )
-        
-        # Initialize LLM dengan tools
-        self.llm = ChatOpenAI(
-            model=settings.default_llm_model,
-            temperature=0.1,  # Low temperature untuk faktual response
-            api_key=settings.deepseek_api_key,
-            base_url=settings.deepseek_base_url
-        ).bind_tools(upstream_tools)
-        
-        # System prompt yang sangat spesifik
-        self.system_prompt = SystemMessage(content="""
+UPSTREAM_SYSTEM_PROMPT = SystemMessage(content="""
 You are the Upstream Production Specialist for XYZ.
 
 Your expertise:
@@ -69,13 +46,21 @@ Response format:
 - Flag any issues or anomalies
 - Be concise but complete
 """)
-        
-        logger.info("Upstream Agent initialized", model=settings.default_llm_model)
+
+UPSTREAM_TOOL_NAMES = tuple(tool.name for tool in upstream_tools)
+
+UPSTREAM_SPEC = AgentSpec("Upstream Agent", upstream_tools, UPSTREAM_SYSTEM_PROMPT, UPSTREAM_DESCRIPTION)
+
+
+class UpstreamAgent(Agent):
+    """
+    Agen khusus untuk menangani pertanyaan terkait produksi upstream XYZ.
+    Memiliki akses ke data produksi, lifting schedule, dan status sumur.
+    """
     
-    def get_prompt(self) -> SystemMessage:
-        """Return the system prompt for this agent"""
-        return self.system_prompt
+    # Metadata statis di level class - bisa dibaca tanpa membuat instance (dan LLM client)
+    name, tools, system_prompt, description = UPSTREAM_SPEC
+    tools_list = UPSTREAM_TOOL_NAMES
     
-    def get_llm(self):
-        """Return the configured LLM with tools"""
-        return self.llm
+    def __init__(self):
+        super().__init__(*UPSTREAM_SPEC)
@@ -0,0 +1,91 @@
+"""
+Fast Path - Eksekusi langsung untuk query single-agent yang sederhana
+Jika argumen tool bisa diambil dengan regex (misal nama blok atau kapal), tool dipanggil
+langsung tanpa LangGraph loop dan tanpa LLM call untuk memilih tool
+"""
+import re
+from typing import Awaitable, Callable, Dict, Optional
+from src.tools.upstream_tools import get_production_data
+from src.tools.logistics_tools import track_vessel
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_BLOCK_RE = re.compile(r"\b(Rokan|Mahakam|Cepu)\b", re.IGNORECASE)
+_PRODUCTION_RE = re.compile(r"\bproduc|\bproduksi", re.IGNORECASE)
+_VESSEL_RE = re.compile(r"\bMT\s+XYZ\s+(Prime|Excellence)\b", re.IGNORECASE)
+_VESSEL_INTENT_RE = re.compile(
+    r"\bwhere\b|\bposition\b|\btrack|\bETA\b|\bposisi\b|\bdi\s?mana\b",
+    re.IGNORECASE
+)
+
+# Kata yang menandakan kebutuhan lebih dari satu tool - serahkan ke orchestrator
+_COMPLEX_RE = re.compile(
+    r"\blifting\b|\bschedule\b|\bjadwal\b|\bwell\b|\bsumur\b|\bweather\b|\bcuaca\b"
+    r"|\bdelay|\bcompare\b|\bbandingkan\b|\bforecast\b|\brevenue\b|\bwhy\b|\bkenapa\b",
+    re.IGNORECASE
+)
+
+
+async def _upstream_production(query: str) -> Optional[str]:
+    """Produksi satu blok: 'What is the production in Rokan?'"""
+    if not _PRODUCTION_RE.search(query):
+        return None
+    blocks = {match.capitalize() for match in _BLOCK_RE.findall(query)}
+    if len(blocks) != 1:
+        return None
+    
+    data = await get_production_data.ainvoke({"block_name": blocks.pop()})
+    return (
+        f"Current production at the {data['block']} block ({data['date']}): "
+        f"{data['oil_production_bopd']:,} BOPD oil and "
+        f"{data['gas_production_mmscfd']:,} MMSCFD gas from "
+        f"{data['wells_active']:,} active wells. "
+        f"Status: {data['status']} (data quality: {data['data_quality']})."
+    )
+
+
+async def _logistics_vessel_position(query: str) -> Optional[str]:
+    """Posisi satu kapal: 'Where is MT XYZ Prime right now?'"""
+    if not _VESSEL_INTENT_RE.search(query):
+        return None
+    vessels = {match.capitalize() for match in _VESSEL_RE.findall(query)}
+    if len(vessels) != 1:
+        return None
+    
+    data = await track_vessel.ainvoke({"vessel_name": f"MT XYZ {vessels.pop()}"})
+    position = data["current_position"]
+    return (
+        f"{data['vessel_name']} is currently in {data['current_location']} "
+        f"({position['latitude']}, {position['longitude']}), sailing from "
+        f"{data['origin']} to {data['destination']} at {data['speed_knots']} knots. "
+        f"Status: {data['status'].replace('_', ' ')}, ETA {data['eta_hours']} hours, "
+        f"carrying {data['cargo_volume_barrels']:,} barrels."
+    )
+
+
+FAST_PATH_HANDLERS: Dict[str, Callable[[str], Awaitable[Optional[str]]]] = {
+    "UPSTREAM": _upstream_production,
+    "LOGISTICS": _logistics_vessel_position
+}
+
+
+async def try_fast_path(routing_decision: str, query: str) -> Optional[str]:
+    """
+    Jalankan handler fast path untuk routing single-agent, jika query cukup sederhana
+    
+    Args:
+        routing_decision: Output classify_intent
+        query: Query mentah dari user
+    
+    Returns:
+        Response final, atau None jika query harus lewat orchestrator
+    """
+    handler = FAST_PATH_HANDLERS.get(routing_decision)
+    if handler is None or _COMPLEX_RE.search(query):
+        return None
+    
+    response = await handler(query)
+    if response is not None:
+        logger.info("Fast path hit", routing=routing_decision)
+    return response
@@ -5,20 +5,164 @@ Mengikuti pola Hub-and-Spoke dari penelitian:
 - Fleksibilitas dinamis dalam routing
 - Isolasi konteks per agen
 """
-from typing import Literal, Dict, Any, List
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import SystemMessage, HumanMessage
+import asyncio
+import re
+import ahocorasick
+from functools import cached_property, lru_cache
+from typing import Literal, Dict, Any, List, AsyncIterator, Optional
+from langchain_core.messages import SystemMessage, HumanMessage, ToolMessage
 from langgraph.graph import StateGraph, END
-from langgraph.prebuilt import ToolNode
+from langgraph.types import Send
 from src.utils.state import AgentState
-from src.utils.config import settings
+from src.utils.config import get_settings
 from src.utils.logger import get_logger
-from src.agents.upstream_agent import UpstreamAgent
-from src.agents.logistics_agent import LogisticsAgent
-from src.agents.finance_agent import FinanceAgent
+from src.utils.llm import shared_http_client, shared_async_http_client
+from src.utils.clock import request_clock
+from src.utils.cache import normalize_query, has_temporal_reference, SemanticCache
+from src.agents.base import Agent
+from src.agents.registry import AGENT_SPECS
 
 logger = get_logger(__name__)
 
+# Graph nodes yang merupakan specialist agent (untuk event streaming)
+_AGENT_NODES = ("upstream", "logistics", "finance")
+
+# Satu pass regex untuk semua routing token (tanpa \b: "_" termasuk word char,
+# sehingga \bUPSTREAM\b tidak akan match di dalam "UPSTREAM_LOGISTICS")
+_ROUTE_RE = re.compile(r"UPSTREAM|LOGISTICS|FINANCE|ALL_AGENTS")
+_ROUTE_MAP = {
+    "UPSTREAM": ("upstream",),
+    "LOGISTICS": ("logistics",),
+    "FINANCE": ("finance",),
+    "ALL_AGENTS": _AGENT_NODES
+}
+
+# Vocabulary per domain untuk keyword classifier (lowercase, spasi tunggal).
+# Kata umum bahasa Inggris ("well", "track", "field", "port", "route", "delay",
+# "block", "output") hanya dipakai dalam frasa yang jelas domainnya: "as well as",
+# "keep track of" atau "delay the meeting" tidak boleh memicu routing
+_DOMAIN_VOCABULARY = {
+    "UPSTREAM": (
+        "production", "produksi", "produce", "produces", "produced", "producing",
+        "oil output", "gas output", "bopd", "mmscfd", "wells", "oil well", "gas well",
+        "sumur", "lifting", "oil field", "oil fields", "oilfield", "oilfields",
+        "gas field", "gas fields", "oil block", "gas block", "blok", "rokan",
+        "mahakam", "cepu", "reservoir", "drilling"
+    ),
+    "LOGISTICS": (
+        "vessel", "vessels", "kapal", "tanker", "tankers", "ship", "shipping",
+        "shipment", "shipments", "shipped", "pengiriman", "deliver", "delivery",
+        "deliveries", "delivered", "weather", "cuaca", "eta", "shipping route",
+        "sea route", "loading port", "discharge port", "pelabuhan", "voyage", "cargo",
+        "demurrage", "vessel tracking", "mt xyz", "kilang"
+    ),
+    "FINANCE": (
+        "$", "finance", "finances", "revenue", "pendapatan", "cost", "costs", "biaya",
+        "profit", "profits", "profitability", "profitable", "margin", "margins",
+        "price", "prices", "harga", "market", "financial", "keuangan", "usd", "idr",
+        "rupiah", "icp", "cash flow"
+    )
+}
+
+
+def _build_domain_automaton() -> ahocorasick.Automaton:
+    """Compile semua vocabulary domain menjadi satu Aho-Corasick automaton"""
+    automaton = ahocorasick.Automaton()
+    for domain, terms in _DOMAIN_VOCABULARY.items():
+        for term in terms:
+            automaton.add_word(term, (len(term), domain))
+    automaton.make_automaton()
+    return automaton
+
+
+# Satu pass O(panjang query) untuk semua domain, berapapun ukuran vocabulary
+_DOMAIN_AUTOMATON = _build_domain_automaton()
+
+
+def _is_whole_word(text: str, start: int, end: int) -> bool:
+    """Match harus berdiri sendiri ("eta" tidak boleh match di dalam "metadata")"""
+    if text[start].isalnum() and start > 0 and text[start - 1].isalnum():
+        return False
+    if text[end].isalnum() and end + 1 < len(text) and text[end + 1].isalnum():
+        return False
+    return True
+
+
+def classify_by_keywords(query: str) -> Optional[str]:
+    """
+    Classify query secara deterministik berdasarkan keyword domain
+    
+    Args:
+        query: Query user
+    
+    Returns:
+        Routing decision (misal "UPSTREAM", "UPSTREAM_LOGISTICS" atau "ALL_AGENTS"),
+        atau None jika tidak ada keyword domain sama sekali (serahkan ke LLM)
+    """
+    text = query.lower()
+    domains = set()
+    for end, (length, domain) in _DOMAIN_AUTOMATON.iter(text):
+        if _is_whole_word(text, end - length + 1, end):
+            domains.add(domain)
+    
+    if not domains:
+        return None
+    if len(domains) == len(_DOMAIN_VOCABULARY):
+        return "ALL_AGENTS"
+    return "_".join(domain for domain in _DOMAIN_VOCABULARY if domain in domains)
+
+
+# Prompt statis synthesizer sebagai prefix byte-identik di setiap call, agar
+# prefix cache di sisi provider (DeepSeek context caching) bisa dipakai ulang
+_SYNTHESIZER_SYSTEM_PROMPT = SystemMessage(content=(
+    "You are synthesizing responses from multiple XYZ specialist agents.\n"
+    "Create a cohesive, integrated final response from the agent responses provided."
+))
+
+
+def agents_for_routing(routing: str) -> List[str]:
+    """
+    Map routing decision ke daftar agent node (urut, tanpa duplikat)
+    
+    Args:
+        routing: Output classify_intent, misal "UPSTREAM_LOGISTICS"
+    
+    Returns:
+        List nama agent node, misal ["upstream", "logistics"]
+    """
+    agents = []
+    for token in _ROUTE_RE.findall(routing):
+        for agent in _ROUTE_MAP[token]:
+            if agent not in agents:
+                agents.append(agent)
+    return agents
+
+
+def parse_routing_label(content: str) -> str:
+    """
+    Ekstrak label routing dari output router LLM
+    
+    Token domain diambil dengan _ROUTE_RE di mana pun posisinya, sehingga jawaban
+    yang sedikit "cerewet" ("Routing: UPSTREAM") atau bergaya lain ("UPSTREAM + LOGISTICS")
+    tetap dikenali. Tanpa token domain, atau jika model minta klarifikasi, hasilnya CLARIFY.
+    
+    Args:
+        content: Teks mentah dari router LLM (bisa terpotong oleh max_tokens)
+    
+    Returns:
+        Label routing kanonik (misal "UPSTREAM_LOGISTICS" atau "ALL_AGENTS"), atau "CLARIFY"
+    """
+    text = content.upper().replace(" ", "_")
+    if "CLARIFY" in text:
+        return "CLARIFY"
+    
+    agents = set(agents_for_routing(text))
+    if not agents:
+        return "CLARIFY"
+    if len(agents) == len(_AGENT_NODES):
+        return "ALL_AGENTS"
+    return "_".join(agent.upper() for agent in _AGENT_NODES if agent in agents)
+
 
 class OrchestratorAgent:
     """
@@ -27,20 +171,11 @@ class OrchestratorAgent:
     """
     
     def __init__(self):
+        settings = get_settings()
         self.name = "Orchestrator"
         
-        # Initialize specialist agents
-        self.upstream_agent = UpstreamAgent()
-        self.logistics_agent = LogisticsAgent()
-        self.finance_agent = FinanceAgent()
-        
-        # Router LLM - menggunakan model yang lebih kuat untuk reasoning
-        self.router_llm = ChatOpenAI(
-            model=settings.orchestrator_model,
-            temperature=0,  # Deterministic routing
-            api_key=settings.deepseek_api_key,
-            base_url=settings.deepseek_base_url
-        )
+        # Router, synthesizer, dan specialist agents dibuat lazy (lihat cached_property dan _get_agent
+        # di bawah) - import langchain_openai dan konstruksi client baru dibayar saat dipakai
         
         # System prompt untuk routing
         self.system_prompt = SystemMessage(content="""
@@ -68,8 +203,8 @@ Examples:
 "What's the production in Rokan?" → UPSTREAM
 "Where is MT XYZ Prime?" → LOGISTICS
 "How much revenue from 500k barrels?" → FINANCE
-"Status of Rokan production and its shipment to Balongan?" → UPSTREAM + LOGISTICS
-"Profitability of Rokan block considering shipping delays?" → ALL THREE
+"Status of Rokan production and its shipment to Balongan?" → UPSTREAM_LOGISTICS
+"Profitability of Rokan block considering shipping delays?" → ALL_AGENTS
 
 Your response must be ONE of:
 - "UPSTREAM" (only upstream needed)
@@ -83,248 +218,374 @@ Your response must be ONE of:
 
 Respond with ONLY the routing decision, nothing else.
 """)
+
+        # Semantic cache untuk parafrase ("Rokan production?" vs "What's Rokan's oil output?")
+        self.semantic_cache = SemanticCache(
+            model_name=settings.semantic_cache_model,
+            threshold=settings.semantic_cache_threshold,
+            ttl_seconds=settings.semantic_cache_ttl
+        ) if settings.semantic_cache_enabled else None
+        
+        # Routing adalah fungsi deterministik dari query (temperature=0),
+        # jadi hasilnya di-memoize per instance berdasarkan query yang dinormalisasi
+        self._classify_intent_cached = lru_cache(maxsize=4096)(self._classify_intent_uncached)
+        
+        # System prompt per agent diambil sekali dari spec (SystemMessage yang sama persis
+        # di setiap call) - tidak perlu membuat agent dulu
+        self._prompts = {key: spec.system_prompt for key, spec in AGENT_SPECS.items()}
+        
+        # Specialist agent dibuat per node saat pertama dipakai (lihat _get_agent):
+        # query FINANCE saja hanya membangun FinanceAgent
+        self._agents: Dict[str, Agent] = {}
+        
+        # Graph statis - compile sekali, dipakai ulang oleh setiap request.
+        # Tanpa checkpointer: tiap query berdiri sendiri, state tidak menumpuk per thread_id
+        self._compiled_app = self.build_graph().compile()
+        
+        # Production (tanpa concern cold start): bangun semua client sekarang
+        # agar query pertama tidak membayar konstruksinya
+        if settings.prewarm_llm_clients:
+            self._prewarm()
         
         logger.info("Orchestrator initialized", 
                    router_model=settings.orchestrator_model,
                    specialist_agents=["upstream", "logistics", "finance"])
     
+    @cached_property
+    def router_llm(self):
+        """
+        Router LLM - menggunakan model yang lebih kuat untuk reasoning
+        
+        InMemoryCache hanya di router: (prompt, model) identik langsung dijawab dari cache.
+        Tidak global - output agent/synthesizer bergantung pada data tool yang berubah.
+        max_tokens kecil: label terpanjang ("UPSTREAM_LOGISTICS") hanya beberapa token (plus
+        ruang untuk prefix pendek seperti "Routing:"), jadi penjelasan panjang dipotong di
+        decode alih-alih dibayar lalu dibuang
+        """
+        from langchain_core.caches import InMemoryCache
+        from langchain_openai import ChatOpenAI
+        
+        settings = get_settings()
+        return ChatOpenAI(
+            model=settings.orchestrator_model,
+            temperature=0,  # Deterministic routing
+            max_tokens=16,
+            api_key=settings.deepseek_api_key,
+            base_url=settings.deepseek_base_url,
+            http_client=shared_http_client,
+            http_async_client=shared_async_http_client,
+            cache=InMemoryCache(maxsize=10_000)
+        )
+    
+    @cached_property
+    def synthesizer_llm(self):
+        """
+        Synthesizer LLM - streaming agar token pertama jawaban final langsung diteruskan
+        ke client (/query/stream); router tetap non-streaming karena output-nya satu label
+        """
+        from langchain_openai import ChatOpenAI
+        
+        settings = get_settings()
+        return ChatOpenAI(
+            model=settings.orchestrator_model,
+            temperature=0,
+            api_key=settings.deepseek_api_key,
+            base_url=settings.deepseek_base_url,
+            http_client=shared_http_client,
+            http_async_client=shared_async_http_client,
+            streaming=True
+        )
+    
+    def _prewarm(self):
+        """Bangun router, synthesizer, dan semua specialist agent sekarang (bukan saat query pertama)"""
+        _ = self.router_llm
+        _ = self.synthesizer_llm
+        for key in AGENT_SPECS:
+            self._get_agent(key)
+    
+    def _get_agent(self, key: str) -> Agent:
+        """Specialist agent untuk node `key` dari AGENT_SPECS, dibuat dan di-memoize saat pertama dipakai"""
+        agent = self._agents.get(key)
+        if agent is None:
+            agent = self._agents[key] = Agent(*AGENT_SPECS[key])
+        return agent
+    
     def classify_intent(self, query: str) -> str:
         """
         Classify user intent and determine routing.
         This is the 'brain' function that decides which agent(s) to call.
+        Case and whitespace variants of the same query share one cached decision.
         """
+        return self._classify_intent_cached(normalize_query(query))
+    
+    def _classify_intent_uncached(self, query: str) -> str:
+        """Classify a normalized query by keywords, calling the router LLM only when ambiguous"""
+        routing_decision = classify_by_keywords(query)
+        if routing_decision is not None:
+            logger.info("Intent classified", 
+                       query=query[:100], 
+                       routing=routing_decision,
+                       method="keyword")
+            return routing_decision
+        
         messages = [
             self.system_prompt,
             HumanMessage(content=f"User query: {query}")
         ]
         
         response = self.router_llm.invoke(messages)
-        routing_decision = response.content.strip().upper()
+        routing_decision = parse_routing_label(response.content)
         
         logger.info("Intent classified", 
                    query=query[:100], 
-                   routing=routing_decision)
+                   routing=routing_decision,
+                   method="llm")
         
         return routing_decision
     
     def build_graph(self) -> StateGraph:
         """
         Build the LangGraph workflow.
-        This implements the Hub-and-Spoke architecture.
+        This implements the Hub-and-Spoke architecture: entry point fans out ke semua
+        agent yang dibutuhkan secara paralel, lalu synthesizer menggabungkan hasilnya.
         """
         # Initialize graph
         workflow = StateGraph(AgentState)
         
-        # Add nodes for each specialist agent
-        workflow.add_node("upstream", self._upstream_node)
-        workflow.add_node("logistics", self._logistics_node)
-        workflow.add_node("finance", self._finance_node)
+        # Add nodes for each specialist agent (masing-masing menjalankan tool loop sendiri)
+        for node in _AGENT_NODES:
+            workflow.add_node(node, self._make_agent_node(node))
         workflow.add_node("synthesizer", self._synthesizer_node)
         
-        # Add tool execution nodes
-        workflow.add_node("upstream_tools", 
-                         ToolNode(self.upstream_agent.tools))
-        workflow.add_node("logistics_tools", 
-                         ToolNode(self.logistics_agent.tools))
-        workflow.add_node("finance_tools", 
-                         ToolNode(self.finance_agent.tools))
-        
-        # Add router node
-        workflow.add_node("router", self._router_node)
-        workflow.set_entry_point("router")
-        
-        # Define routing logic
-        workflow.add_conditional_edges(
-            "router",
-            self._route_to_agent,
-            {
-                "upstream": "upstream",
-                "logistics": "logistics",
-                "finance": "finance",
-                "clarify": END
-            }
-        )
-        
-        workflow.add_conditional_edges(
-            "upstream",
-            self._should_continue,
-            {
-                "continue": "upstream_tools",
-                "synthesizer": "synthesizer",
-                "end": END
-            }
-        )
-        
-        workflow.add_conditional_edges(
-            "logistics",
-            self._should_continue,
-            {
-                "continue": "logistics_tools",
-                "synthesizer": "synthesizer",
-                "end": END
-            }
-        )
-        
-        workflow.add_conditional_edges(
-            "finance",
-            self._should_continue,
-            {
-                "continue": "finance_tools",
-                "synthesizer": "synthesizer",
-                "end": END
-            }
+        # Entry point: routing sudah ada di initial state (diklasifikasi di run()).
+        # Fan-out: satu Send per agent yang dibutuhkan, dieksekusi dalam superstep yang sama
+        workflow.set_conditional_entry_point(
+            self._route_to_agents,
+            [*_AGENT_NODES, END]
         )
         
-        # Tool nodes return to their respective agents
-        workflow.add_edge("upstream_tools", "upstream")
-        workflow.add_edge("logistics_tools", "logistics")
-        workflow.add_edge("finance_tools", "finance")
+        # Fan-in: multi-agent bertemu di synthesizer (dijalankan sekali setelah semua selesai)
+        for node in _AGENT_NODES:
+            workflow.add_conditional_edges(
+                node,
+                self._after_agent,
+                {
+                    "synthesizer": "synthesizer",
+                    "end": END
+                }
+            )
         
         # Synthesizer ends the workflow
         workflow.add_edge("synthesizer", END)
         
         return workflow
 
-    def _router_node(self, state: AgentState) -> AgentState:
-        """Node to classify intent if not already done"""
-        if not state.get("intent_classification"):
-            query = state["messages"][-1].content
-            routing = self.classify_intent(query)
-            return {"intent_classification": routing}
-        return state
-
-    def _route_to_agent(self, state: AgentState) -> str:
-        """Route to the first agent based on classification"""
-        routing = state.get("intent_classification", "")
-        
-        if "UPSTREAM" in routing:
-            return "upstream"
-        elif "LOGISTICS" in routing:
-            return "logistics"
-        elif "FINANCE" in routing:
-            return "finance"
-        else:
-            return "clarify"
+    def _route_to_agents(self, state: AgentState):
+        """Dispatch the query to every agent in the routing decision, in parallel"""
+        agents = agents_for_routing(state.intent_classification or "")
+        if not agents:
+            return END
+        return [Send(agent, state) for agent in agents]
+    
+    def _after_agent(self, state: AgentState) -> Literal["synthesizer", "end"]:
+        """Multi-agent routing needs synthesis; a single agent answers directly"""
+        agents = agents_for_routing(state.intent_classification or "")
+        return "synthesizer" if len(agents) > 1 else "end"
 
-    async def run(self, query: str, user_id: str = "anonymous", user_role: str = "user") -> Dict[str, Any]:
+    def rebuild(self):
+        """Recompile the graph (misal setelah node di-patch dalam test)"""
+        self._compiled_app = self.build_graph().compile()
+    
+    async def run(
+        self,
+        query: str,
+        user_id: str = "anonymous",
+        user_role: str = "user",
+        routing_decision: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Run the full multi-agent workflow for a query.
+        Pass routing_decision if the caller already classified the query.
+        Paraphrases of a recent query (same role) are served from the semantic cache,
+        except queries that reference relative time ("today", "now", ...).
         """
-        app = self.build_graph().compile()
-        
-        initial_state: AgentState = {
-            "messages": [HumanMessage(content=query)],
-            "user_id": user_id,
-            "session_id": "",
-            "user_role": user_role,
-            "next_agent": None,
-            "current_agent": None,
-            "intent_classification": None,
-            "task_completed": False,
-            "iterations": 0,
-            "max_iterations": settings.max_iterations,
-            "intermediate_data": {},
-            "final_response": None,
-            "response_metadata": {}
-        }
-        
+        query_vector = None
+        if self.semantic_cache is not None and not has_temporal_reference(query):
+            # Cache hanya optimasi: gagal load model / embed tidak boleh menggagalkan query
+            try:
+                # Encoding is CPU-bound, keep it off the event loop
+                vector = await asyncio.to_thread(self.semantic_cache.embed, query)
+                cached = self.semantic_cache.lookup(vector, query, user_role)
+            except Exception as e:
+                logger.warning("Semantic cache lookup failed", error=str(e))
+            else:
+                if cached is not None:
+                    logger.info("Semantic cache hit", query=query[:100])
+                    return {**cached, "cache": "semantic_hit"}
+                query_vector = vector
+        
+        routing_decision = routing_decision or self.classify_intent(query)
+        initial_state = self._initial_state(query, user_id, user_role, routing_decision)
         config = {"configurable": {"thread_id": user_id}}
         
-        # Run the graph
-        final_state = await app.ainvoke(initial_state, config)
+        # Run the graph - semua tool dalam request ini berbagi satu timestamp
+        with request_clock():
+            final_state = await self._compiled_app.ainvoke(initial_state, config)
+        
+        result = self._build_result(final_state)
+        if query_vector is not None:
+            try:
+                self.semantic_cache.store(query_vector, query, user_role, result)
+            except Exception as e:
+                logger.warning("Semantic cache store failed", error=str(e))
+        return result
+    
+    async def run_stream(
+        self,
+        query: str,
+        user_id: str = "anonymous",
+        user_role: str = "user",
+        routing_decision: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run the workflow while streaming progress events.
+        
+        Yields dicts with a "type" key:
+        - "agent": a specialist agent node started
+        - "token": LLM token chunk (with the node that produced it)
+        - "final": same payload as run() once the graph finishes
+        """
+        routing_decision = routing_decision or self.classify_intent(query)
+        initial_state = self._initial_state(query, user_id, user_role, routing_decision)
+        config = {"configurable": {"thread_id": user_id}}
         
+        with request_clock():
+            async for event in self._compiled_app.astream_events(initial_state, config, version="v2"):
+                kind = event["event"]
+                node = event.get("metadata", {}).get("langgraph_node")
+                
+                if kind == "on_chain_start" and event["name"] in _AGENT_NODES:
+                    yield {"type": "agent", "agent": event["name"]}
+                elif kind == "on_chat_model_stream":
+                    content = event["data"]["chunk"].content
+                    if content:
+                        yield {"type": "token", "node": node, "content": content}
+                elif kind == "on_chain_end" and not event.get("parent_ids"):
+                    # Root graph selesai - output berisi final state
+                    yield {"type": "final", **self._build_result(event["data"]["output"])}
+    
+    def _initial_state(
+        self,
+        query: str,
+        user_id: str,
+        user_role: str,
+        routing_decision: str
+    ) -> AgentState:
+        """Build the initial graph state for a query (field lain memakai default AgentState)"""
+        return AgentState(
+            messages=[HumanMessage(content=query)],
+            user_id=user_id,
+            user_role=user_role,
+            intent_classification=routing_decision
+        )
+    
+    def _build_result(self, final_state: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert the final graph state (dict dari LangGraph) into the public result dict"""
         return {
             "response": final_state.get("final_response") or final_state["messages"][-1].content,
             "agents_involved": self._get_agents_involved(final_state),
             "routing_decision": final_state.get("intent_classification", "UNKNOWN")
         }
 
-    def _get_agents_involved(self, state: AgentState) -> list[str]:
-        """Extract involved agents from state"""
-        agents = []
-        routing = state.get("intent_classification", "")
-        if "UPSTREAM" in routing: agents.append("upstream")
-        if "LOGISTICS" in routing: agents.append("logistics")
-        if "FINANCE" in routing: agents.append("finance")
-        return agents
+    def _get_agents_involved(self, state: Dict[str, Any]) -> list[str]:
+        """Extract involved agents from final state"""
+        return agents_for_routing(state.get("intent_classification", ""))
 
-    def _upstream_node(self, state: AgentState) -> AgentState:
-        """Execute upstream agent"""
-        logger.info("Executing upstream agent")
-        
-        messages = [self.upstream_agent.get_prompt()] + state["messages"]
-        response = self.upstream_agent.get_llm().invoke(messages)
+    async def _run_agent(self, key: str, state: AgentState) -> Dict[str, Any]:
+        """
+        Run one specialist's tool-calling loop in isolation.
         
-        return {
-            "messages": [response],
-            "current_agent": "upstream"
-        }
+        Tool call dan hasilnya hanya ada di konteks lokal agent; yang ditulis ke
+        state global hanya jawaban final, sehingga agent paralel tidak saling tumpang tindih.
+        """
+        agent = self._get_agent(key)
+        messages = [self._prompts[key], *state.messages]
+        tools_by_name = {tool.name: tool for tool in agent.tools}
+        max_iterations = state.max_iterations
+        
+        response = await agent.llm.ainvoke(messages)
+        for _ in range(max_iterations):
+            if not response.tool_calls:
+                break
+            messages.append(response)
+            # Tool call dalam satu giliran independen - jalankan bersamaan
+            messages.extend(await asyncio.gather(*(
+                self._execute_tool_call(tools_by_name, tool_call)
+                for tool_call in response.tool_calls
+            )))
+            response = await agent.llm.ainvoke(messages)
+        
+        return {"messages": [response], "agent_outputs": [response.content]}
     
-    def _logistics_node(self, state: AgentState) -> AgentState:
-        """Execute logistics agent"""
-        logger.info("Executing logistics agent")
-        
-        messages = [self.logistics_agent.get_prompt()] + state["messages"]
-        response = self.logistics_agent.get_llm().invoke(messages)
-        
-        return {
-            "messages": [response],
-            "current_agent": "logistics"
-        }
+    @staticmethod
+    async def _execute_tool_call(tools_by_name: Dict[str, Any], tool_call: Dict[str, Any]) -> ToolMessage:
+        """Execute a single tool call, returning errors to the LLM instead of raising"""
+        tool = tools_by_name.get(tool_call["name"])
+        if tool is None:
+            return ToolMessage(
+                content=f"Error: unknown tool {tool_call['name']}",
+                tool_call_id=tool_call["id"],
+                status="error"
+            )
+        try:
+            return await tool.ainvoke(tool_call)
+        except Exception as e:
+            logger.warning("Tool call failed", tool=tool_call["name"], error=str(e))
+            return ToolMessage(
+                content=f"Error: {e}",
+                tool_call_id=tool_call["id"],
+                status="error"
+            )
     
-    def _finance_node(self, state: AgentState) -> AgentState:
-        """Execute finance agent"""
-        logger.info("Executing finance agent")
+    def _make_agent_node(self, key: str):
+        """
+        Build the graph node for one specialist agent.
         
-        messages = [self.finance_agent.get_prompt()] + state["messages"]
-        response = self.finance_agent.get_llm().invoke(messages)
+        Agent di-resolve di dalam _run_agent saat node dijalankan, sehingga agent tetap
+        dibuat lazy. Closure sengaja hanya menangkap key, bukan agent: compile() LangGraph
+        meng-getattr nonlocal closure node dan akan membangun semua agent saat startup.
+        """
+        async def agent_node(state: AgentState) -> Dict[str, Any]:
+            logger.info("Executing agent", agent=key)
+            return await self._run_agent(key, state)
         
-        return {
-            "messages": [response],
-            "current_agent": "finance"
-        }
+        return agent_node
     
-    def _synthesizer_node(self, state: AgentState) -> AgentState:
+    async def _synthesizer_node(self, state: AgentState) -> Dict[str, Any]:
         """
         Synthesize responses from multiple agents into final answer.
+        Streamed, so run_stream() forwards tokens as soon as they are generated.
         """
         logger.info("Synthesizing multi-agent responses")
         
-        agent_responses = []
-        for msg in state["messages"]:
-            if hasattr(msg, 'content') and msg.content and not isinstance(msg, HumanMessage):
-                agent_responses.append(msg.content)
-        
-        synthesis_prompt = f"""
-        You are synthesizing responses from multiple XYZ specialist agents.
-        
-        Agent Responses:
-        {chr(10).join(f"- {resp}" for resp in agent_responses[-3:])}
+        # Jawaban agent dibaca langsung dari reducer field, tanpa scan ulang message history.
+        # Instruksi statis di depan, hanya jawaban agent yang berubah di belakang
+        agent_block = "\n".join(map("- ".__add__, filter(None, state.agent_outputs)))
+        messages = [
+            _SYNTHESIZER_SYSTEM_PROMPT,
+            HumanMessage(content=f"Agent Responses:\n{agent_block}")
+        ]
         
-        Create a cohesive, integrated final response.
-        """
+        final_response = None
+        async for chunk in self.synthesizer_llm.astream(messages):
+            final_response = chunk if final_response is None else final_response + chunk
         
-        final_response = self.router_llm.invoke([HumanMessage(content=synthesis_prompt)])
+        # Stream kosong (provider tidak mengirim chunk): ambil jawaban lewat call biasa
+        if final_response is None:
+            final_response = await self.synthesizer_llm.ainvoke(messages)
         
         return {
             "messages": [final_response],
             "final_response": final_response.content,
             "task_completed": True
         }
-    
-    def _should_continue(
-        self, 
-        state: AgentState
-    ) -> Literal["continue", "synthesizer", "end"]:
-        """
-        Determine if agent should continue.
-        """
-        last_message = state["messages"][-1]
-        
-        if hasattr(last_message, 'tool_calls') and last_message.tool_calls:
-            return "continue"
-        
-        if state.get("task_completed", False):
-            return "end"
-        
-        return "end"
@@ -3,9 +3,26 @@ Tools untuk Finance Agent
 Menangani analisis keuangan, revenue, dan profitabilitas
 """
 from langchain_core.tools import tool
-from typing import Dict, Any
-from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Dict, Any, Tuple
+from datetime import timedelta
 import random
+from src.utils import clock
+from src.utils.cache import cache_per_minute
+from src.tools.schemas import to_payload, RevenueImpact, OperationalCost, Profitability, MarketPriceTrend
+
+
+# Mock reference data (read-only, dibuat sekali saat import)
+_USD_TO_IDR = 15800
+_COST_PER_BARREL = MappingProxyType({
+    "Rokan": 22.5,
+    "Mahakam": 28.0,
+    "Cepu": 35.0
+})
+_BASE_PRICES = MappingProxyType({
+    "crude_oil": 85.0,
+    "natural_gas": 3.2  # per MMBTU
+})
 
 
 @tool
@@ -31,21 +48,18 @@ def calculate_revenue_impact(
             "total_revenue_usd": 42500000
         }
     """
-    # Conversion rate USD to IDR (mock)
-    usd_to_idr = 15800
-    
     revenue_usd = oil_volume_barrels * oil_price_usd
-    revenue_idr = revenue_usd * usd_to_idr
-    
-    return {
-        "volume_barrels": oil_volume_barrels,
-        "price_per_barrel_usd": oil_price_usd,
-        "total_revenue_usd": round(revenue_usd, 2),
-        "total_revenue_idr": round(revenue_idr, 2),
-        "exchange_rate": usd_to_idr,
-        "calculation_date": datetime.now().strftime("%Y-%m-%d"),
-        "price_benchmark": "Indonesian Crude Price (ICP)"
-    }
+    revenue_idr = revenue_usd * _USD_TO_IDR
+    
+    return to_payload(RevenueImpact(
+        volume_barrels=oil_volume_barrels,
+        price_per_barrel_usd=oil_price_usd,
+        total_revenue_usd=round(revenue_usd, 2),
+        total_revenue_idr=round(revenue_idr, 2),
+        exchange_rate=_USD_TO_IDR,
+        calculation_date=clock.today(),
+        price_benchmark="Indonesian Crude Price (ICP)"
+    ))
 
 
 @tool
@@ -72,14 +86,8 @@ def analyze_operational_cost(
             "total_daily_cost_usd": 3375000
         }
     """
-    # Mock operating cost per barrel (berbeda per blok)
-    cost_per_barrel = {
-        "Rokan": 22.5,
-        "Mahakam": 28.0,
-        "Cepu": 35.0
-    }
-    
-    opex = cost_per_barrel.get(block_name, 25.0)
+    # Operating cost per barrel berbeda per blok
+    opex = _COST_PER_BARREL.get(block_name, 25.0)
     daily_cost = production_volume_bopd * opex
     
     # Breakdown cost components
@@ -88,19 +96,19 @@ def analyze_operational_cost(
     energy_pct = 0.20
     other_pct = 0.20
     
-    return {
-        "block": block_name,
-        "production_volume_bopd": production_volume_bopd,
-        "operating_cost_per_barrel_usd": opex,
-        "total_daily_cost_usd": round(daily_cost, 2),
-        "cost_breakdown": {
+    return to_payload(OperationalCost(
+        block=block_name,
+        production_volume_bopd=production_volume_bopd,
+        operating_cost_per_barrel_usd=opex,
+        total_daily_cost_usd=round(daily_cost, 2),
+        cost_breakdown={
             "labor_usd": round(daily_cost * labor_pct, 2),
             "maintenance_usd": round(daily_cost * maintenance_pct, 2),
             "energy_usd": round(daily_cost * energy_pct, 2),
             "other_usd": round(daily_cost * other_pct, 2)
         },
-        "analysis_date": datetime.now().strftime("%Y-%m-%d")
-    }
+        analysis_date=clock.today()
+    ))
 
 
 @tool
@@ -140,15 +148,29 @@ def calculate_profitability(
     else:
         assessment = "Low - Requires cost optimization"
     
-    return {
-        "revenue_usd": round(revenue_usd, 2),
-        "operating_cost_usd": round(operating_cost_usd, 2),
-        "gross_profit_usd": round(gross_profit, 2),
-        "profit_margin_percentage": round(margin_percentage, 2),
-        "profitability_assessment": assessment,
-        "breakeven_volume_bopd": round(operating_cost_usd / 85, 0),  # Assuming $85/barrel
-        "calculation_timestamp": datetime.now().isoformat()
-    }
+    return to_payload(Profitability(
+        revenue_usd=round(revenue_usd, 2),
+        operating_cost_usd=round(operating_cost_usd, 2),
+        gross_profit_usd=round(gross_profit, 2),
+        profit_margin_percentage=round(margin_percentage, 2),
+        profitability_assessment=assessment,
+        breakeven_volume_bopd=round(operating_cost_usd / 85, 0),  # Assuming $85/barrel
+        calculation_timestamp=clock.now_iso()
+    ))
+
+
+@cache_per_minute()
+def _draw_market_trend(commodity: str, days_back: int) -> Tuple[float, str, str]:
+    """Draw mock (faktor harga 30 hari lalu, volatilitas, outlook) untuk satu komoditas"""
+    return (
+        random.uniform(0.90, 1.05),
+        random.choice(["low", "moderate", "high"]),
+        random.choice([
+            "Prices expected to stabilize",
+            "Potential upward pressure from demand",
+            "Risk of correction due to oversupply"
+        ])
+    )
 
 
 @tool
@@ -171,33 +193,24 @@ def get_market_price_trends(commodity: str = "crude_oil", days_back: int = 30) -
             "trend": "upward"
         }
     """
-    # Mock price data
-    base_prices = {
-        "crude_oil": 85.0,
-        "natural_gas": 3.2  # per MMBTU
-    }
-    
-    current_price = base_prices.get(commodity, 0)
-    price_30d_ago = current_price * random.uniform(0.90, 1.05)
+    current_price = _BASE_PRICES.get(commodity, 0)
+    price_factor, volatility, outlook = _draw_market_trend(commodity, days_back)
+    price_30d_ago = current_price * price_factor
     
     trend = "upward" if current_price > price_30d_ago else "downward"
     change_pct = ((current_price - price_30d_ago) / price_30d_ago * 100)
     
-    return {
-        "commodity": commodity,
-        "current_price_usd": round(current_price, 2),
-        "price_30_days_ago_usd": round(price_30d_ago, 2),
-        "price_change_percentage": round(change_pct, 2),
-        "trend": trend,
-        "volatility": random.choice(["low", "moderate", "high"]),
-        "forecast_outlook": random.choice([
-            "Prices expected to stabilize",
-            "Potential upward pressure from demand",
-            "Risk of correction due to oversupply"
-        ]),
-        "data_source": "Mock Market Data",
-        "last_updated": datetime.now().isoformat()
-    }
+    return to_payload(MarketPriceTrend(
+        commodity=commodity,
+        current_price_usd=round(current_price, 2),
+        price_30_days_ago_usd=round(price_30d_ago, 2),
+        price_change_percentage=round(change_pct, 2),
+        trend=trend,
+        volatility=volatility,
+        forecast_outlook=outlook,
+        data_source="Mock Market Data",
+        last_updated=clock.now_iso()
+    ))
 
 
 # Export all tools
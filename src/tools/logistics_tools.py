@@ -3,9 +3,44 @@ Tools untuk Logistics Agent
 Menangani tracking kapal tanker dan data cuaca untuk pengiriman
 """
 from langchain_core.tools import tool
-from typing import Dict, Any, List
-from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Dict, Any, List, Tuple
+from datetime import timedelta
 import random
+from src.utils import clock
+from src.utils.cache import cache_per_minute
+from src.tools.schemas import to_payload, VesselTracking, WeatherForecast, DeliveryStatus
+
+
+# Mock vessel data (read-only, dibuat sekali saat import)
+_VESSEL_ROUTES = MappingProxyType({
+    "MT XYZ Prime": MappingProxyType({
+        "origin": "Dumai Terminal",
+        "destination": "Kilang Balongan",
+        "current_location": "Selat Sunda",
+        "position": MappingProxyType({"latitude": -6.123, "longitude": 106.456})
+    }),
+    "MT XYZ Excellence": MappingProxyType({
+        "origin": "Balikpapan Terminal",
+        "destination": "Kilang Cilacap",
+        "current_location": "Selat Makassar",
+        "position": MappingProxyType({"latitude": -3.456, "longitude": 118.789})
+    })
+})
+_UNKNOWN_ROUTE = MappingProxyType({
+    "origin": "Unknown",
+    "destination": "Unknown",
+    "current_location": "Unknown",
+    "position": MappingProxyType({"latitude": 0, "longitude": 0})
+})
+
+
+@cache_per_minute()
+def _draw_vessel_reading(vessel_name: str) -> Tuple[int, int, int]:
+    """Draw mock (dampak cuaca ke kecepatan, volume kargo, ETA jam) untuk satu kapal"""
+    # Simulasi kondisi cuaca yang mempengaruhi kecepatan
+    weather_impact = random.choice([0, 0, -2, -4, -6])  # Mostly normal, kadang lambat
+    return weather_impact, random.randint(450000, 550000), random.randint(12, 30)
 
 
 @tool
@@ -28,48 +63,28 @@ def track_vessel(vessel_name: str) -> Dict[str, Any]:
             "eta_hours": 18
         }
     """
-    # Mock vessel data
-    routes = {
-        "MT XYZ Prime": {
-            "origin": "Dumai Terminal",
-            "destination": "Kilang Balongan",
-            "current_location": "Selat Sunda",
-            "position": {"latitude": -6.123, "longitude": 106.456}
-        },
-        "MT XYZ Excellence": {
-            "origin": "Balikpapan Terminal",
-            "destination": "Kilang Cilacap",
-            "current_location": "Selat Makassar",
-            "position": {"latitude": -3.456, "longitude": 118.789}
-        }
-    }
-    
-    vessel_data = routes.get(
-        vessel_name,
-        {
-            "origin": "Unknown",
-            "destination": "Unknown",
-            "current_location": "Unknown",
-            "position": {"latitude": 0, "longitude": 0}
-        }
-    )
-    
-    # Simulasi kondisi cuaca yang mempengaruhi kecepatan
-    weather_impact = random.choice([0, 0, -2, -4, -6])  # Mostly normal, kadang lambat
+    vessel_data = _VESSEL_ROUTES.get(vessel_name, _UNKNOWN_ROUTE)
+    weather_impact, cargo_volume, eta_hours = _draw_vessel_reading(vessel_name)
     base_speed = 14
     
-    return {
-        "vessel_name": vessel_name,
-        "origin": vessel_data["origin"],
-        "destination": vessel_data["destination"],
-        "current_location": vessel_data["current_location"],
-        "current_position": vessel_data["position"],
-        "speed_knots": base_speed + weather_impact,
-        "status": "on_schedule" if weather_impact >= -2 else "delayed",
-        "cargo_volume_barrels": random.randint(450000, 550000),
-        "eta_hours": random.randint(12, 30),
-        "timestamp": datetime.now().isoformat()
-    }
+    return to_payload(VesselTracking(
+        vessel_name=vessel_name,
+        origin=vessel_data["origin"],
+        destination=vessel_data["destination"],
+        current_location=vessel_data["current_location"],
+        current_position=dict(vessel_data["position"]),
+        speed_knots=base_speed + weather_impact,
+        status="on_schedule" if weather_impact >= -2 else "delayed",
+        cargo_volume_barrels=cargo_volume,
+        eta_hours=eta_hours,
+        timestamp=clock.now_iso()
+    ))
+
+
+@cache_per_minute()
+def _draw_weather(location: str, hours_ahead: int) -> Tuple[float, float, int]:
+    """Draw mock (tinggi gelombang, kecepatan angin, visibilitas) untuk satu lokasi"""
+    return random.uniform(0.5, 4.5), random.uniform(8, 35), random.randint(5, 20)
 
 
 @tool
@@ -94,8 +109,7 @@ def get_weather_forecast(location: str, hours_ahead: int = 24) -> Dict[str, Any]
         }
     """
     # Mock weather data
-    wave_height = random.uniform(0.5, 4.5)
-    wind_speed = random.uniform(8, 35)
+    wave_height, wind_speed, visibility = _draw_weather(location, hours_ahead)
     
     # Determine risk level
     if wave_height > 3.5 or wind_speed > 30:
@@ -108,17 +122,46 @@ def get_weather_forecast(location: str, hours_ahead: int = 24) -> Dict[str, Any]
         risk_level = "low"
         navigation_advice = "Normal sailing conditions."
     
-    return {
-        "location": location,
-        "forecast_period_hours": hours_ahead,
-        "wave_height_meters": round(wave_height, 1),
-        "wind_speed_knots": round(wind_speed, 1),
-        "visibility_km": random.randint(5, 20),
-        "risk_level": risk_level,
-        "navigation_advice": navigation_advice,
-        "forecast_timestamp": datetime.now().isoformat(),
-        "valid_until": (datetime.now() + timedelta(hours=hours_ahead)).isoformat()
+    return to_payload(WeatherForecast(
+        location=location,
+        forecast_period_hours=hours_ahead,
+        wave_height_meters=round(wave_height, 1),
+        wind_speed_knots=round(wind_speed, 1),
+        visibility_km=visibility,
+        risk_level=risk_level,
+        navigation_advice=navigation_advice,
+        forecast_timestamp=clock.now_iso(),
+        valid_until=(clock.now() + timedelta(hours=hours_ahead)).isoformat()
+    ))
+
+
+@cache_per_minute()
+def _draw_delivery(shipment_id: str) -> Tuple[str, int, str, str, str, int, int, int]:
+    """
+    Draw mock (status, progress, blok asal, kilang tujuan, kapal, volume,
+    hari sejak berangkat, jam hingga tiba) untuk satu shipment
+    """
+    statuses = ["scheduled", "loading", "in_transit", "arrived", "discharged"]
+    current_status = random.choice(statuses)
+    
+    status_progress = {
+        "scheduled": 0,
+        "loading": 20,
+        "in_transit": random.randint(30, 80),
+        "arrived": 90,
+        "discharged": 100
     }
+    
+    return (
+        current_status,
+        status_progress[current_status],
+        random.choice(["Rokan", "Mahakam", "Cepu"]),
+        random.choice(["Kilang Balongan", "Kilang Cilacap", "Kilang Balikpapan"]),
+        f"MT XYZ {random.choice(['Prime', 'Excellence'])}",
+        random.randint(450000, 550000),
+        random.randint(1, 5),
+        random.randint(6, 48)
+    )
 
 
 @tool
@@ -140,29 +183,24 @@ def get_delivery_status(shipment_id: str) -> Dict[str, Any]:
             "progress_percentage": 65
         }
     """
-    statuses = ["scheduled", "loading", "in_transit", "arrived", "discharged"]
-    current_status = random.choice(statuses)
-    
-    status_progress = {
-        "scheduled": 0,
-        "loading": 20,
-        "in_transit": random.randint(30, 80),
-        "arrived": 90,
-        "discharged": 100
-    }
-    
-    return {
-        "shipment_id": shipment_id,
-        "status": current_status,
-        "progress_percentage": status_progress[current_status],
-        "origin_block": random.choice(["Rokan", "Mahakam", "Cepu"]),
-        "destination_refinery": random.choice(["Kilang Balongan", "Kilang Cilacap", "Kilang Balikpapan"]),
-        "vessel_assigned": f"MT XYZ {random.choice(['Prime', 'Excellence'])}",
-        "volume_barrels": random.randint(450000, 550000),
-        "departure_date": (datetime.now() - timedelta(days=random.randint(1, 5))).strftime("%Y-%m-%d"),
-        "estimated_arrival": (datetime.now() + timedelta(hours=random.randint(6, 48))).isoformat(),
-        "last_updated": datetime.now().isoformat()
-    }
+    (
+        current_status, progress, origin_block, destination_refinery,
+        vessel, volume, days_since_departure, hours_to_arrival
+    ) = _draw_delivery(shipment_id)
+    
+    # Tanggal relatif terhadap jam request, bukan jam saat draw di-cache
+    return to_payload(DeliveryStatus(
+        shipment_id=shipment_id,
+        status=current_status,
+        progress_percentage=progress,
+        origin_block=origin_block,
+        destination_refinery=destination_refinery,
+        vessel_assigned=vessel,
+        volume_barrels=volume,
+        departure_date=(clock.now() - timedelta(days=days_since_departure)).strftime("%Y-%m-%d"),
+        estimated_arrival=(clock.now() + timedelta(hours=hours_to_arrival)).isoformat(),
+        last_updated=clock.now_iso()
+    ))
 
 
 # Export all tools
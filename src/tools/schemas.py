@@ -0,0 +1,141 @@
+"""
+Output Schemas untuk Tools
+Setiap tool membangun dataclass (slots) lalu dikonversi ke dict melalui orjson dengan
+urutan key deterministik, sehingga JSON yang dilihat LLM byte-identik untuk data yang sama
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List
+import orjson
+
+
+def to_payload(data: Any) -> Dict[str, Any]:
+    """
+    Convert dataclass tool output ke dict dengan urutan key deterministik
+    
+    Args:
+        data: Instance dataclass output tool
+    
+    Returns:
+        Dictionary yang siap dikirim sebagai tool result. Key level atas mengikuti
+        urutan field dataclass, dict nested diurutkan alfabetis (OPT_SORT_KEYS)
+    """
+    return orjson.loads(orjson.dumps(data, option=orjson.OPT_SORT_KEYS))
+
+
+# Upstream
+
+@dataclass(slots=True)
+class ProductionData:
+    block: str
+    date: str
+    oil_production_bopd: int
+    gas_production_mmscfd: int
+    status: str
+    wells_active: int
+    data_quality: str
+
+
+@dataclass(slots=True)
+class LiftingSchedule:
+    block: str
+    schedule_period_days: int
+    schedule: List[Dict[str, Any]]
+    total_volume_barrels: int
+
+
+@dataclass(slots=True)
+class WellStatusReport:
+    block: str
+    total_wells_queried: int
+    wells: List[Dict[str, Any]]
+    query_timestamp: str
+
+
+# Logistics
+
+@dataclass(slots=True)
+class VesselTracking:
+    vessel_name: str
+    origin: str
+    destination: str
+    current_location: str
+    current_position: Dict[str, float]
+    speed_knots: int
+    status: str
+    cargo_volume_barrels: int
+    eta_hours: int
+    timestamp: str
+
+
+@dataclass(slots=True)
+class WeatherForecast:
+    location: str
+    forecast_period_hours: int
+    wave_height_meters: float
+    wind_speed_knots: float
+    visibility_km: int
+    risk_level: str
+    navigation_advice: str
+    forecast_timestamp: str
+    valid_until: str
+
+
+@dataclass(slots=True)
+class DeliveryStatus:
+    shipment_id: str
+    status: str
+    progress_percentage: int
+    origin_block: str
+    destination_refinery: str
+    vessel_assigned: str
+    volume_barrels: int
+    departure_date: str
+    estimated_arrival: str
+    last_updated: str
+
+
+# Finance
+
+@dataclass(slots=True)
+class RevenueImpact:
+    volume_barrels: int
+    price_per_barrel_usd: float
+    total_revenue_usd: float
+    total_revenue_idr: float
+    exchange_rate: int
+    calculation_date: str
+    price_benchmark: str
+
+
+@dataclass(slots=True)
+class OperationalCost:
+    block: str
+    production_volume_bopd: int
+    operating_cost_per_barrel_usd: float
+    total_daily_cost_usd: float
+    cost_breakdown: Dict[str, float]
+    analysis_date: str
+
+
+@dataclass(slots=True)
+class Profitability:
+    revenue_usd: float
+    operating_cost_usd: float
+    gross_profit_usd: float
+    profit_margin_percentage: float
+    profitability_assessment: str
+    breakeven_volume_bopd: float
+    calculation_timestamp: str
+
+
+@dataclass(slots=True)
+class MarketPriceTrend:
+    commodity: str
+    current_price_usd: float
+    price_30_days_ago_usd: float
+    price_change_percentage: float
+    trend: str
+    volatility: str
+    forecast_outlook: str
+    data_source: str
+    last_updated: str
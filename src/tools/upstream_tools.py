@@ -3,9 +3,23 @@ Tools untuk Upstream Agent
 Mengikuti prinsip MCP: tools yang dapat digunakan ulang dan terdokumentasi dengan baik
 """
 from langchain_core.tools import tool
-from typing import Dict, Any, List
-from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Dict, Any, List, Tuple
+from datetime import timedelta
 import random
+from src.utils import clock
+from src.utils.cache import cache_per_minute
+from src.tools.schemas import to_payload, ProductionData, LiftingSchedule, WellStatusReport
+
+
+# Mock data - dalam implementasi real, ini akan query database atau API.
+# Read-only dan dibuat sekali saat import
+_BLOCKS_DATA = MappingProxyType({
+    "Rokan": MappingProxyType({"oil": 150000, "gas": 450, "wells": 2500}),
+    "Mahakam": MappingProxyType({"oil": 85000, "gas": 1200, "wells": 1800}),
+    "Cepu": MappingProxyType({"oil": 35000, "gas": 180, "wells": 450}),
+})
+_UNKNOWN_BLOCK = MappingProxyType({"oil": 0, "gas": 0, "wells": 0})
 
 
 @tool
@@ -31,27 +45,31 @@ def get_production_data(block_name: str) -> Dict[str, Any]:
             "wells_active": 2500
         }
     """
-    # Mock data - dalam implementasi real, ini akan query database atau API
-    blocks_data = {
-        "Rokan": {"oil": 150000, "gas": 450, "wells": 2500},
-        "Mahakam": {"oil": 85000, "gas": 1200, "wells": 1800},
-        "Cepu": {"oil": 35000, "gas": 180, "wells": 450},
-    }
+    block_info = _BLOCKS_DATA.get(block_name, _UNKNOWN_BLOCK)
     
-    block_info = blocks_data.get(
-        block_name, 
-        {"oil": 0, "gas": 0, "wells": 0}
+    return to_payload(ProductionData(
+        block=block_name,
+        date=clock.today(),
+        oil_production_bopd=block_info["oil"],
+        gas_production_mmscfd=block_info["gas"],
+        status="operational" if block_info["oil"] > 0 else "unknown",
+        wells_active=block_info["wells"],
+        data_quality="real-time"
+    ))
+
+
+@cache_per_minute()
+def _draw_lifting_schedule(block_name: str, days_ahead: int) -> Tuple[Tuple[int, int, str, str], ...]:
+    """Draw mock jadwal blok (offset hari, volume, kapal, tujuan) - setiap 2-3 hari ada lifting"""
+    return tuple(
+        (
+            i,
+            random.randint(400000, 600000),
+            f"MT XYZ {random.choice(['Prime', 'Excellence', 'Victory', 'Glory'])}",
+            random.choice(["Kilang Balongan", "Kilang Cilacap", "Terminal BBM Tanjung Priok"])
+        )
+        for i in range(0, days_ahead, random.randint(2, 3))
     )
-    
-    return {
-        "block": block_name,
-        "date": datetime.now().strftime("%Y-%m-%d"),
-        "oil_production_bopd": block_info["oil"],
-        "gas_production_mmscfd": block_info["gas"],
-        "status": "operational" if block_info["oil"] > 0 else "unknown",
-        "wells_active": block_info["wells"],
-        "data_quality": "real-time"
-    }
 
 
 @tool
@@ -76,24 +94,40 @@ def get_lifting_schedule(block_name: str, days_ahead: int = 7) -> Dict[str, Any]
             ]
         }
     """
-    schedule = []
-    base_date = datetime.now()
+    base_date = clock.now()
     
-    # Generate mock schedule (setiap 2-3 hari ada lifting)
-    for i in range(0, days_ahead, random.randint(2, 3)):
-        schedule.append({
+    # Tanggal dihitung dari jam request, hanya angka mock yang di-cache
+    schedule = [
+        {
             "date": (base_date + timedelta(days=i)).strftime("%Y-%m-%d"),
-            "volume_barrels": random.randint(400000, 600000),
-            "vessel": f"MT XYZ {random.choice(['Prime', 'Excellence', 'Victory', 'Glory'])}",
-            "destination": random.choice(["Kilang Balongan", "Kilang Cilacap", "Terminal BBM Tanjung Priok"])
-        })
+            "volume_barrels": volume,
+            "vessel": vessel,
+            "destination": destination
+        }
+        for i, volume, vessel, destination in _draw_lifting_schedule(block_name, days_ahead)
+    ]
     
-    return {
-        "block": block_name,
-        "schedule_period_days": days_ahead,
-        "schedule": schedule,
-        "total_volume_barrels": sum(s["volume_barrels"] for s in schedule)
-    }
+    return to_payload(LiftingSchedule(
+        block=block_name,
+        schedule_period_days=days_ahead,
+        schedule=schedule,
+        total_volume_barrels=sum(s["volume_barrels"] for s in schedule)
+    ))
+
+
+@cache_per_minute()
+def _draw_well_status(well_ids: Tuple[str, ...]) -> Tuple[Tuple[str, str, int, int, int], ...]:
+    """Draw mock status per sumur: (id, status, production_bopd, downtime_hours, jam hingga restart)"""
+    wells = []
+    for well_id in well_ids:
+        status = random.choice(["producing", "producing", "producing", "maintenance", "shut-in"])
+        if status == "producing":
+            wells.append((well_id, status, random.randint(80, 200), 0, 0))
+        elif status == "maintenance":
+            wells.append((well_id, status, 0, random.randint(24, 120), random.randint(12, 72)))
+        else:
+            wells.append((well_id, status, 0, 0, 0))
+    return tuple(wells)
 
 
 @tool
@@ -123,27 +157,27 @@ def get_well_status(block_name: str, well_ids: List[str] = None) -> Dict[str, An
         well_ids = [f"{block_name[:3].upper()}-{str(i).zfill(3)}" for i in range(1, 6)]
     
     wells = []
-    for well_id in well_ids:
-        status = random.choice(["producing", "producing", "producing", "maintenance", "shut-in"])
+    for well_id, status, production, downtime, restart_hours in _draw_well_status(well_ids):
         well_data = {
             "id": well_id,
             "status": status,
         }
         
         if status == "producing":
-            well_data["production_bopd"] = random.randint(80, 200)
+            well_data["production_bopd"] = production
         elif status == "maintenance":
-            well_data["downtime_hours"] = random.randint(24, 120)
-            well_data["expected_restart"] = (datetime.now() + timedelta(hours=random.randint(12, 72))).isoformat()
+            well_data["downtime_hours"] = downtime
+            # Relatif terhadap jam request, bukan jam saat draw di-cache
+            well_data["expected_restart"] = (clock.now() + timedelta(hours=restart_hours)).isoformat()
         
         wells.append(well_data)
     
-    return {
-        "block": block_name,
-        "total_wells_queried": len(wells),
-        "wells": wells,
-        "query_timestamp": datetime.now().isoformat()
-    }
+    return to_payload(WellStatusReport(
+        block=block_name,
+        total_wells_queried=len(wells),
+        wells=wells,
+        query_timestamp=clock.now_iso()
+    ))
 
 
 # Export all tools
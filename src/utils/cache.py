@@ -0,0 +1,233 @@
+"""
+Response Caching Utility
+Helper untuk cache response agent: normalisasi query, exact-match cache key,
+dan semantic cache untuk parafrase
+"""
+import hashlib
+import re
+import threading
+import time
+from functools import lru_cache, wraps
+from typing import Any, Callable, Dict, FrozenSet, List, Optional
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize query agar variasi huruf besar/kecil dan spasi menghasilkan key yang sama
+    
+    Args:
+        query: Query mentah dari user
+    
+    Returns:
+        Query lowercase dengan whitespace yang sudah dirapikan
+    """
+    return " ".join(query.lower().split())
+
+
+def response_cache_key(query: str, user_role: Optional[str]) -> bytes:
+    """
+    Build exact-match cache key untuk pasangan (query, user_role)
+    
+    Args:
+        query: Query mentah dari user
+        user_role: Role user (RBAC) - response tidak dibagi antar role
+    
+    Returns:
+        Digest 16-byte dari query yang sudah dinormalisasi
+    """
+    raw = f"{user_role}|{normalize_query(query)}"
+    return hashlib.blake2b(raw.encode(), digest_size=16).digest()
+
+
+def _minute_bucket() -> int:
+    """Index menit wall-clock saat ini (berubah sekali per 60 detik)"""
+    return int(time.time() // 60)
+
+
+def cache_per_minute(maxsize: int = 256) -> Callable:
+    """
+    Decorator untuk memoize draw data mock tool: argumen identik dalam menit yang
+    sama mengembalikan angka yang sama
+    
+    Argumen list dikonversi ke tuple agar bisa di-hash. Hasil dibagi antar pemanggil,
+    jadi fungsi yang di-cache harus mengembalikan nilai immutable (tuple) dan tidak
+    boleh berisi timestamp - tool men-stamp waktu request dan membangun dict payload
+    baru di setiap call.
+    
+    Args:
+        maxsize: Jumlah maksimum kombinasi (argumen, menit) yang disimpan
+    
+    Returns:
+        Decorator yang membungkus fungsi dengan lru_cache per bucket menit
+    """
+    def decorator(func: Callable) -> Callable:
+        @lru_cache(maxsize=maxsize)
+        def cached(bucket: int, *args, **kwargs):
+            return func(*args, **kwargs)
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            args = tuple(tuple(a) if isinstance(a, list) else a for a in args)
+            kwargs = {k: tuple(v) if isinstance(v, list) else v for k, v in kwargs.items()}
+            return cached(_minute_bucket(), *args, **kwargs)
+        
+        wrapper.cache_clear = cached.cache_clear
+        return wrapper
+    
+    return decorator
+
+
+# Entity yang harus identik sebelum semantic hit diterima: angka (volume, harga),
+# nama blok/kilang/kapal, dan ID shipment. Tanpa ini "500,000 barrels at $85"
+# dan "300k barrels at $85" akan dianggap pertanyaan yang sama.
+_ENTITY_PATTERN = re.compile(
+    r"\d[\d,.]*\s*[km]?\b"
+    r"|\b(?:rokan|mahakam|cepu|balongan|cilacap|balikpapan|dumai|prime|excellence)\b"
+    r"|\bshp-\d+-\d+\b",
+    re.IGNORECASE
+)
+
+
+def extract_entities(query: str) -> FrozenSet[str]:
+    """
+    Extract numeric dan named entities dari query untuk validasi semantic hit
+    
+    Args:
+        query: Query mentah dari user
+    
+    Returns:
+        Set entity yang sudah dinormalisasi (lowercase, tanpa spasi/koma)
+    """
+    return frozenset(
+        match.group(0).lower().replace(",", "").replace(" ", "")
+        for match in _ENTITY_PATTERN.finditer(query)
+    )
+
+
+# Query dengan referensi waktu relatif bergantung pada data terkini (produksi hari ini,
+# posisi kapal sekarang) - jawabannya tidak boleh dipakai ulang untuk parafrase
+_TEMPORAL_PATTERN = re.compile(
+    r"\b(?:today|now|current(?:ly)?|latest|right now|live|real-?time|tonight"
+    r"|hari ini|sekarang|terkini|terbaru|saat ini)\b",
+    re.IGNORECASE
+)
+
+
+def has_temporal_reference(query: str) -> bool:
+    """
+    Check apakah query menyebut waktu relatif ("today", "now", "latest", ...)
+    
+    Args:
+        query: Query mentah dari user
+    
+    Returns:
+        True jika response untuk query ini tidak aman di-cache secara semantik
+    """
+    return _TEMPORAL_PATTERN.search(query) is not None
+
+
+class SemanticCache:
+    """
+    Semantic cache berbasis embedding untuk menangkap parafrase query.
+    Menggunakan sentence-transformers untuk embedding dan FAISS (inner product
+    pada vektor ternormalisasi = cosine similarity) untuk nearest-neighbour lookup.
+    """
+    
+    def __init__(
+        self,
+        model_name: str,
+        threshold: float = 0.93,
+        ttl_seconds: int = 600,
+        maxsize: int = 4096
+    ):
+        self.model_name = model_name
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        
+        # Model dan index di-load saat pertama dipakai agar import tetap ringan
+        self._embedder = None
+        self._index = None
+        self._entries: List[Dict[str, Any]] = []
+        # embed() dipanggil dari beberapa worker thread (asyncio.to_thread) sekaligus
+        self._load_lock = threading.Lock()
+    
+    def _ensure_loaded(self):
+        """Load model dan index sekali (double-checked lock antar thread)"""
+        if self._embedder is not None:
+            return
+        with self._load_lock:
+            if self._embedder is not None:
+                return
+            import faiss
+            from sentence_transformers import SentenceTransformer
+            
+            embedder = SentenceTransformer(self.model_name)
+            self._index = faiss.IndexFlatIP(embedder.get_sentence_embedding_dimension())
+            self._embedder = embedder
+    
+    def load(self):
+        """Load model dan index sekarang (dipanggil saat startup agar request pertama tidak membayarnya)"""
+        self._ensure_loaded()
+    
+    def embed(self, query: str):
+        """Encode query menjadi vektor ternormalisasi (shape: 1 x dim)"""
+        self._ensure_loaded()
+        return self._embedder.encode([query], normalize_embeddings=True)
+    
+    def lookup(self, vector, query: str, user_role: Optional[str]) -> Optional[Any]:
+        """
+        Cari response tersimpan yang cukup mirip dengan query.
+        
+        Hit hanya diterima jika similarity melewati threshold, role sama,
+        belum kedaluwarsa, dan entity (angka, nama blok, dll) identik.
+        """
+        if not self._entries:
+            return None
+        
+        entities = extract_entities(query)
+        now = time.monotonic()
+        scores, indices = self._index.search(vector, min(4, len(self._entries)))
+        
+        for score, idx in zip(scores[0], indices[0], strict=True):
+            if idx < 0 or score < self.threshold:
+                break
+            entry = self._entries[idx]
+            if (
+                entry["user_role"] == user_role
+                and now - entry["ts"] < self.ttl_seconds
+                and entry["entities"] == entities
+            ):
+                return entry["value"]
+        
+        return None
+    
+    def store(self, vector, query: str, user_role: Optional[str], value: Any):
+        """Simpan response beserta embedding query-nya"""
+        self._ensure_loaded()
+        if len(self._entries) >= self.maxsize:
+            self._evict_expired()
+        
+        self._index.add(vector)
+        self._entries.append({
+            "query": query,
+            "user_role": user_role,
+            "entities": extract_entities(query),
+            "value": value,
+            "ts": time.monotonic()
+        })
+    
+    def _evict_expired(self):
+        """Rebuild index tanpa entry kedaluwarsa (FlatIP tidak mendukung delete per item)"""
+        now = time.monotonic()
+        live = [
+            (i, entry) for i, entry in enumerate(self._entries)
+            if now - entry["ts"] < self.ttl_seconds
+        ][-(self.maxsize // 2):]
+        vectors = [self._index.reconstruct(i) for i, _ in live]
+        
+        self._index.reset()
+        if vectors:
+            import numpy as np
+            self._index.add(np.vstack(vectors))
+        self._entries = [entry for _, entry in live]
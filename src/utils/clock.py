@@ -0,0 +1,56 @@
+"""
+Request Clock - Satu timestamp per request untuk semua tools
+Orchestrator membaca jam sistem sekali di awal request dan memformatnya sekali;
+semua tool dalam request yang sama memakai nilai yang sama (byte-identik antar tool)
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class _RequestClock:
+    now: datetime
+    iso: str
+    date: str
+
+
+_REQUEST_CLOCK: ContextVar[Optional[_RequestClock]] = ContextVar("request_clock", default=None)
+
+
+def _make_clock(moment: datetime) -> _RequestClock:
+    return _RequestClock(now=moment, iso=moment.isoformat(), date=moment.strftime("%Y-%m-%d"))
+
+
+@contextmanager
+def request_clock() -> Iterator[None]:
+    """
+    Bekukan waktu request saat ini untuk semua tool yang dipanggil di dalam blok ini
+    
+    Context var ikut terbawa ke task asyncio dan executor thread yang dibuat di dalamnya
+    """
+    token = _REQUEST_CLOCK.set(_make_clock(datetime.now()))
+    try:
+        yield
+    finally:
+        _REQUEST_CLOCK.reset(token)
+
+
+def now() -> datetime:
+    """Waktu request (setara datetime.now())"""
+    clock = _REQUEST_CLOCK.get()
+    return clock.now if clock is not None else datetime.now()
+
+
+def now_iso() -> str:
+    """Waktu request dalam format ISO 8601 (setara datetime.now().isoformat())"""
+    clock = _REQUEST_CLOCK.get()
+    return clock.iso if clock is not None else datetime.now().isoformat()
+
+
+def today() -> str:
+    """Tanggal request dalam format YYYY-MM-DD"""
+    clock = _REQUEST_CLOCK.get()
+    return clock.date if clock is not None else datetime.now().strftime("%Y-%m-%d")
@@ -2,8 +2,12 @@
 Application Configuration
 Menggunakan pydantic-settings untuk type-safe configuration management
 """
-from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+import json
+import logging
+from functools import cached_property, lru_cache
+from pydantic import field_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
+from typing import Annotated, Any, Optional
 
 
 class Settings(BaseSettings):
@@ -30,12 +34,22 @@ class Settings(BaseSettings):
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     log_level: str = "INFO"
+    request_log_sample_rate: float = 0.01  # fraksi request non-/query yang di-log
     
     # Agent Configuration
     default_llm_model: str = "deepseek-chat"
     orchestrator_model: str = "deepseek-chat"
     max_iterations: int = 10
     agent_timeout: int = 300
+    prewarm_llm_clients: bool = False  # Bangun semua LLM client saat startup, bukan saat query pertama
+    
+    # Response Cache
+    response_cache_maxsize: int = 2048
+    response_cache_ttl: int = 300  # detik
+    semantic_cache_enabled: bool = True
+    semantic_cache_model: str = "BAAI/bge-small-en-v1.5"
+    semantic_cache_threshold: float = 0.93
+    semantic_cache_ttl: int = 600  # detik
     
     # Database
     chroma_persist_directory: str = "./data/chroma"
@@ -43,13 +57,44 @@ class Settings(BaseSettings):
     
     # Security
     api_key_header: str = "X-API-Key"
-    allowed_origins: str = "http://localhost:3000,http://localhost:8000"
+    # NoDecode: nilai env diteruskan mentah ke validator (bukan di-decode sebagai JSON dulu)
+    allowed_origins: Annotated[list[str], NoDecode] = [
+        "http://localhost:3000",
+        "http://localhost:8000"
+    ]
+    
+    @field_validator("allowed_origins", mode="before")
+    @classmethod
+    def _parse_allowed_origins(cls, value: Any) -> Any:
+        """Terima JSON list ('["https://a", "https://b"]') atau CSV ('https://a,https://b')"""
+        if not isinstance(value, str):
+            return value
+        if value.lstrip().startswith("["):
+            return json.loads(value)
+        return [origin.strip() for origin in value.split(",") if origin.strip()]
+    
+    @cached_property
+    def log_level_int(self) -> int:
+        """LOG_LEVEL sebagai integer level logging (di-resolve sekali per instance settings)"""
+        return logging.getLevelNamesMapping()[self.log_level.upper()]
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Settings singleton, dibuat saat pertama kali dibutuhkan (bukan saat import)
+    
+    Membaca .env dan validasi pydantic hanya sekali; test bisa override environment
+    lalu memanggil get_settings.cache_clear()
     
-    @property
-    def allowed_origins_list(self) -> list[str]:
-        """Parse allowed origins as list"""
-        return [origin.strip() for origin in self.allowed_origins.split(",")]
+    Returns:
+        Instance Settings yang dipakai bersama
+    """
+    return Settings()
 
 
-# Global settings instance
-settings = Settings()
+def __getattr__(name: str):
+    """Backward compatibility: `from src.utils.config import settings` tetap berfungsi"""
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
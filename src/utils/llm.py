@@ -0,0 +1,77 @@
+"""
+LLM Client Factory
+Semua LLM client (agent, router, synthesizer) berbagi satu connection pool HTTP ke DeepSeek
+agar koneksi TCP/TLS dipakai ulang
+"""
+import asyncio
+from importlib.util import find_spec
+import httpx
+from src.utils.config import get_settings
+
+
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=50, max_connections=100)
+
+# HTTP/2 untuk pool async: LLM call paralel saat fan-out multiplex di satu koneksi.
+# Butuh paket h2 (httpx[http2]); tanpa itu tetap HTTP/1.1 keep-alive
+_HTTP2_AVAILABLE = find_spec("h2") is not None
+
+# Shared pools - sync untuk .invoke(), async untuk .ainvoke()/.astream()
+shared_http_client = httpx.Client(limits=_HTTP_LIMITS, timeout=60.0)
+shared_async_http_client = httpx.AsyncClient(
+    limits=_HTTP_LIMITS,
+    timeout=60.0,
+    http2=_HTTP2_AVAILABLE
+)
+
+
+def make_llm(tools: list):
+    """
+    Build a specialist agent LLM bound to its tools
+    
+    Args:
+        tools: List of LangChain tools untuk agent
+    
+    Returns:
+        ChatOpenAI runnable dengan tools ter-bind, memakai shared HTTP pool
+    """
+    # Import lokal: langchain_openai (+ openai SDK) mahal di-import, baru dibayar
+    # saat LLM client pertama dibuat, bukan saat startup
+    from langchain_openai import ChatOpenAI
+    
+    settings = get_settings()
+    return ChatOpenAI(
+        model=settings.default_llm_model,
+        temperature=0.1,  # Low temperature untuk faktual response
+        api_key=settings.deepseek_api_key,
+        base_url=settings.deepseek_base_url,
+        http_client=shared_http_client,
+        http_async_client=shared_async_http_client
+    ).bind_tools(tools)
+
+
+async def prewarm_shared_clients(timeout: float = 5.0):
+    """
+    Buka koneksi TCP/TLS ke DeepSeek saat startup agar query pertama tidak membayar handshake
+    
+    Status response diabaikan (401/404 pun sudah cukup untuk menyimpan koneksi di pool)
+    
+    Args:
+        timeout: Batas waktu per request prewarm dalam detik
+    
+    Returns:
+        List exception dari request yang gagal (kosong jika semua koneksi terbuka)
+    """
+    settings = get_settings()
+    url = f"{settings.deepseek_base_url.rstrip('/')}/models"
+    results = await asyncio.gather(
+        shared_async_http_client.get(url, timeout=timeout),
+        asyncio.to_thread(shared_http_client.get, url, timeout=timeout),
+        return_exceptions=True
+    )
+    return [r for r in results if isinstance(r, Exception)]
+
+
+async def aclose_shared_clients():
+    """Close shared HTTP pools (dipanggil saat aplikasi shutdown)"""
+    shared_http_client.close()
+    await shared_async_http_client.aclose()
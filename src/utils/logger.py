@@ -3,41 +3,107 @@ Structured Logging Utility
 Menggunakan structlog untuk logging yang lebih informatif dan mudah di-parse
 """
 import structlog
+import atexit
 import logging
 import sys
-from src.utils.config import settings
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+import orjson
+from src.utils.config import get_settings
+
+
+def _orjson_renderer(_, __, event_dict) -> str:
+    """
+    JSON renderer berbasis orjson (pengganti JSONRenderer yang memakai stdlib json)
+    
+    default=str menangani tipe non-native (misal Decimal atau object custom) alih-alih raise
+    """
+    return orjson.dumps(event_dict, default=str).decode()
+
+
+_STACK_INFO_RENDERER = structlog.processors.StackInfoRenderer()
+
+# Listener thread yang menulis log ke stdout (lihat setup_logging)
+_queue_listener = None
+
+
+def _exc_and_stack_info(logger, method_name, event_dict):
+    """
+    StackInfoRenderer + format_exc_info dalam satu processor yang early-return
+    
+    Hampir semua record tidak membawa stack_info/exc_info, jadi cukup satu cek key
+    alih-alih dua processor penuh per record
+    """
+    if "stack_info" not in event_dict and "exc_info" not in event_dict:
+        return event_dict
+    event_dict = _STACK_INFO_RENDERER(logger, method_name, event_dict)
+    return structlog.processors.format_exc_info(logger, method_name, event_dict)
 
 
 def setup_logging():
     """
     Setup structured logging dengan format yang sesuai untuk production
+    
+    Write ke stdout dikerjakan thread QueueListener; caller (event loop / request thread)
+    hanya memasukkan record ke queue dan tidak pernah block di I/O stdout
+    
+    Idempotent: main.py ter-import dua kali saat `python main.py` (sebagai __main__ dan
+    sebagai "main" oleh uvicorn), panggilan kedua tidak boleh mengganti queue/listener
     """
+    global _queue_listener
+    if _queue_listener is not None:
+        return
+    
+    settings = get_settings()
+    level = settings.log_level_int
+    
+    log_queue = SimpleQueue()
+    stdout_handler = logging.StreamHandler(sys.stdout)
+    stdout_handler.setFormatter(logging.Formatter("%(message)s"))
+    
     logging.basicConfig(
         format="%(message)s",
-        stream=sys.stdout,
-        level=getattr(logging, settings.log_level.upper())
+        handlers=[QueueHandler(log_queue)],
+        force=True,
+        level=level
     )
     
+    _queue_listener = QueueListener(log_queue, stdout_handler)
+    _queue_listener.start()
+    # stop() mengosongkan queue dulu, jadi record terakhir tetap tertulis saat exit
+    atexit.register(_queue_listener.stop)
+    
     structlog.configure(
         processors=[
-            structlog.stdlib.add_log_level,
+            structlog.processors.add_log_level,
             structlog.stdlib.add_logger_name,
             structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.StackInfoRenderer(),
-            structlog.processors.format_exc_info,
-            structlog.processors.JSONRenderer() if settings.app_env == "production" 
+            _exc_and_stack_info,
+            _orjson_renderer if settings.app_env == "production" 
             else structlog.dev.ConsoleRenderer()
         ],
-        wrapper_class=structlog.stdlib.BoundLogger,
+        # Method di bawah log level sudah jadi no-op sejak class dibuat: tanpa level check
+        # per call dan tanpa menjalankan processor sama sekali
+        wrapper_class=structlog.make_filtering_bound_logger(level),
         context_class=dict,
+        # Tetap stdlib logger sebagai sink agar output lewat QueueListener di atas
         logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
     )
 
 
+@lru_cache(maxsize=256)
 def get_logger(name: str):
     """
-    Get a structured logger instance
+    Get a structured logger instance (satu instance per nama, di-memoize)
+    
+    Proxy yang di-cache bind konfigurasi structlog saat pertama dipakai; setup_logging()
+    dipanggil sekali saat startup, jadi konfigurasi ulang di runtime tidak perlu didukung.
+    
+    Jika payload log mahal dibangun, guard dulu dengan level check:
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug("State dump", state=build_payload())
     
     Args:
         name: Logger name (biasanya __name__ dari module)
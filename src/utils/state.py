@@ -2,58 +2,75 @@
 State Schema untuk Multi-Agent System
 Mengikuti best practice dari penelitian: konteks terfragmentasi dan terisolasi per agen
 """
-from typing import TypedDict, Annotated, List, Optional, Dict, Any
+from dataclasses import dataclass, field
+from typing import Annotated, List, Optional, Dict, Any
 from langchain_core.messages import BaseMessage
 import operator
+from src.utils.config import get_settings
 
 
-class AgentState(TypedDict):
+def _default_max_iterations() -> int:
+    """Default max_iterations dari settings (get_settings di-cache, jadi hanya attribute read)"""
+    return get_settings().max_iterations
+
+
+@dataclass(slots=True, kw_only=True)
+class AgentState:
     """
     Schema state global yang dibawa antar agen.
     Menggunakan operator.add untuk append-only message history.
+    
+    Dataclass dengan slots: node membaca field lewat attribute dengan layout tetap
+    (tanpa hashing key dict). Update dari node tetap berupa dict parsial, dan output
+    akhir graph (ainvoke/astream_events) dikembalikan LangGraph sebagai dict.
     """
     # Message history (append-only)
     messages: Annotated[List[BaseMessage], operator.add]
     
     # User context
     user_id: str
-    session_id: str
-    user_role: Optional[str]  # Untuk RBAC
+    session_id: str = ""
+    user_role: Optional[str] = None  # Untuk RBAC
     
     # Routing & orchestration
-    next_agent: Optional[str]
-    current_agent: Optional[str]
-    intent_classification: Optional[str]
+    next_agent: Optional[str] = None
+    current_agent: Optional[str] = None
+    intent_classification: Optional[str] = None
     
     # Task tracking
-    task_completed: bool
-    iterations: int
-    max_iterations: int
+    task_completed: bool = False
+    iterations: int = 0
+    max_iterations: int = field(default_factory=_default_max_iterations)
     
     # Intermediate results
-    intermediate_data: Dict[str, Any]
+    intermediate_data: Dict[str, Any] = field(default_factory=dict)
+    # Jawaban final tiap specialist (append-only)
+    agent_outputs: Annotated[List[str], operator.add] = field(default_factory=list)
     
     # Final output
-    final_response: Optional[str]
-    response_metadata: Dict[str, Any]
+    final_response: Optional[str] = None
+    response_metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-class UpstreamAgentState(TypedDict):
+@dataclass(slots=True)
+class UpstreamAgentState:
     """State khusus untuk Upstream Agent - data produksi migas"""
-    production_data: Optional[Dict[str, Any]]
-    well_status: Optional[List[Dict[str, Any]]]
-    lifting_schedule: Optional[Dict[str, Any]]
+    production_data: Optional[Dict[str, Any]] = None
+    well_status: Optional[List[Dict[str, Any]]] = None
+    lifting_schedule: Optional[Dict[str, Any]] = None
 
 
-class LogisticsAgentState(TypedDict):
+@dataclass(slots=True)
+class LogisticsAgentState:
     """State khusus untuk Logistics Agent - tracking kapal & pengiriman"""
-    vessel_tracking: Optional[List[Dict[str, Any]]]
-    weather_data: Optional[Dict[str, Any]]
-    delivery_status: Optional[Dict[str, Any]]
+    vessel_tracking: Optional[List[Dict[str, Any]]] = None
+    weather_data: Optional[Dict[str, Any]] = None
+    delivery_status: Optional[Dict[str, Any]] = None
 
 
-class FinanceAgentState(TypedDict):
+@dataclass(slots=True)
+class FinanceAgentState:
     """State khusus untuk Finance Agent - analisis revenue & cost"""
-    revenue_data: Optional[Dict[str, Any]]
-    cost_analysis: Optional[Dict[str, Any]]
-    profitability_metrics: Optional[Dict[str, Any]]
+    revenue_data: Optional[Dict[str, Any]] = None
+    cost_analysis: Optional[Dict[str, Any]] = None
+    profitability_metrics: Optional[Dict[str, Any]] = None
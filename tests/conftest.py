@@ -0,0 +1,39 @@
+"""
+Shared Fixtures untuk Test Suite
+Agent dan orchestrator dibangun sekali per sesi pytest (per worker jika memakai pytest-xdist);
+konstruksi LLM client dan tool binding tidak diulang di setiap test
+"""
+import pytest
+from src.agents.upstream_agent import UpstreamAgent
+from src.agents.logistics_agent import LogisticsAgent
+from src.agents.finance_agent import FinanceAgent
+from src.orchestrator.orchestrator import OrchestratorAgent
+
+
+@pytest.fixture(scope="session")
+def upstream_agent():
+    """Upstream agent bersama untuk seluruh sesi test"""
+    return UpstreamAgent()
+
+
+@pytest.fixture(scope="session")
+def logistics_agent():
+    """Logistics agent bersama untuk seluruh sesi test"""
+    return LogisticsAgent()
+
+
+@pytest.fixture(scope="session")
+def finance_agent():
+    """Finance agent bersama untuk seluruh sesi test"""
+    return FinanceAgent()
+
+
+@pytest.fixture(scope="session")
+def orchestrator():
+    """
+    Orchestrator bersama untuk seluruh sesi test
+    
+    Test yang mengganti attribute (misal router_llm) harus memakai monkeypatch
+    agar perubahan di-undo setelah test selesai
+    """
+    return OrchestratorAgent()
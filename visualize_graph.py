@@ -1,17 +1,43 @@
 
-from src.orchestrator.orchestrator import OrchestratorAgent
-import os
+import argparse
+import hashlib
+import shutil
+from importlib.util import find_spec
+from pathlib import Path
 
-def visualize_graph():
+OUTPUT_PATH = Path("graph_visualization.png")
+CACHE_DIR = Path(".cache")
+
+def _orchestrator_source() -> Path:
+    # Graph ditentukan oleh source orchestrator (nodes, edges, routing)
+    return Path(find_spec("src.orchestrator.orchestrator").origin)
+
+def _graph_cache_path() -> Path:
+    # Hash source orchestrator, tanpa import/build graph
+    key = hashlib.sha256(_orchestrator_source().read_bytes()).hexdigest()[:16]
+    return CACHE_DIR / f"graph_{key}.png"
+
+def visualize_graph(force: bool = False):
+    # Hanya content hash yang dipercaya: mtime diacak oleh git checkout
+    cache_path = _graph_cache_path()
+    if not force and cache_path.exists():
+        shutil.copyfile(cache_path, OUTPUT_PATH)
+        print(f"✅ Graph unchanged, {OUTPUT_PATH} restored from {cache_path}")
+        return
+    
+    # Import di sini: orchestrator (LangGraph + agents) hanya dibangun jika cache miss
+    from src.orchestrator.orchestrator import OrchestratorAgent
+    
     orchestrator = OrchestratorAgent()
-    graph = orchestrator.build_graph().compile()
+    graph = orchestrator._compiled_app  # Sudah di-compile sekali di __init__
     
     # Generate mermaid diagram
     try:
         mermaid_png = graph.get_graph().draw_mermaid_png()
-        with open("graph_visualization.png", "wb") as f:
-            f.write(mermaid_png)
-        print("✅ Graph visualization saved to graph_visualization.png")
+        OUTPUT_PATH.write_bytes(mermaid_png)
+        CACHE_DIR.mkdir(exist_ok=True)
+        cache_path.write_bytes(mermaid_png)
+        print(f"✅ Graph visualization saved to {OUTPUT_PATH}")
     except Exception as e:
         print(f"❌ Error generating PNG visualization: {e}")
         print("Note: You might need to install graphviz (dot) and pygraphviz/pydot for PNG export.")
@@ -22,4 +48,6 @@ def visualize_graph():
         print("----------------------------------------------")
 
 if __name__ == "__main__":
-    visualize_graph()
+    parser = argparse.ArgumentParser(description="Render the orchestrator LangGraph as PNG")
+    parser.add_argument("--force", action="store_true", help="Re-render even if a cached PNG exists for this graph")
+    visualize_graph(force=parser.parse_args().force)